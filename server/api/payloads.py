@@ -0,0 +1,60 @@
+"""
+Byte payload generators for the binary endpoints.
+
+Bodies are produced chunk by chunk so memory per request is bounded by the
+chunk size, not by the size of the body that was asked for.
+"""
+
+import os
+import random
+from functools import cache
+
+RANDOM_POOL_SIZE = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 10 * 1024
+MAX_WINDOW_SIZE = RANDOM_POOL_SIZE // 2
+SEEDED_BLOCK_SIZE = 64 * 1024
+
+
+@cache
+def random_pool():
+    """Process-wide block of random bytes, generated once on first use"""
+    return memoryview(os.urandom(RANDOM_POOL_SIZE))
+
+
+def random_chunks(n, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Yield ``n`` random bytes in pieces of at most ``chunk_size``.
+
+    Unseeded bodies are windows into ``random_pool()`` at random offsets, so
+    no entropy is drawn per request; windows are at most half the pool so the
+    offsets actually vary. Seeded bodies come from ``random.Random(seed)`` in
+    fixed ``SEEDED_BLOCK_SIZE`` blocks re-sliced to ``chunk_size``, so the same
+    seed gives the same bytes whatever the chunk size.
+    """
+    rng = random.Random(seed)
+    if seed is None:
+        chunk_size = max(1, min(chunk_size, MAX_WINDOW_SIZE))
+        pool = random_pool()
+        last_offset = RANDOM_POOL_SIZE - chunk_size
+        while n > 0:
+            size = min(n, chunk_size)
+            offset = rng.randint(0, last_offset)
+            yield pool[offset:offset + size]
+            n -= size
+    else:
+        chunk_size = max(1, min(chunk_size, RANDOM_POOL_SIZE))
+        buffer = bytearray()
+        while n > 0:
+            size = min(n, chunk_size)
+            while len(buffer) < size:
+                buffer += rng.randbytes(SEEDED_BLOCK_SIZE)
+            yield bytes(buffer[:size])
+            del buffer[:size]
+            n -= size
+
+
+def random_bytes(n, seed=None):
+    """``n`` random bytes: fresh from ``os.urandom``, or reproducible for ``seed``"""
+    if seed is None:
+        return os.urandom(n)
+    return b"".join(random_chunks(n, RANDOM_POOL_SIZE, seed))
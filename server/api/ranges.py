@@ -0,0 +1,125 @@
+"""
+HTTP byte-range support for the virtual ``/api/range/<num>/`` resource.
+
+The resource is ``num`` bytes where byte ``i`` is ``i % 256``. Any slice of it
+is computed from its offset, so serving a range costs memory proportional to
+the chunk size only, however large ``num`` is.
+"""
+
+import re
+import secrets
+from datetime import datetime, timezone
+
+from django.utils.http import http_date, parse_http_date_safe
+
+PATTERN_CHUNK_SIZE = 64 * 1024
+MAX_RANGES = 64
+
+# Every chunk is a window into this block; it is one pattern period longer
+# than a chunk so any start offset fits.
+_PATTERN_BLOCK = memoryview(bytes(range(256)) * (PATTERN_CHUNK_SIZE // 256 + 1))
+
+_RANGE_SPEC = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+LAST_MODIFIED = http_date(datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def resource_etag(num):
+    return f'"range-{num}"'
+
+
+def pattern_chunks(start, end):
+    """Yield bytes ``start`` to ``end`` (exclusive) of the repeating pattern"""
+    while start < end:
+        size = min(end - start, PATTERN_CHUNK_SIZE)
+        offset = start % 256
+        yield _PATTERN_BLOCK[offset:offset + size]
+        start += size
+
+
+def parse_range_header(header, size):
+    """
+    Parse a ``Range`` header against a resource of ``size`` bytes.
+
+    Returns a list of inclusive ``(first, last)`` pairs, or None when the header
+    is malformed or not a byte range and must be ignored (RFC 9110 §14.2).
+    Raises RangeNotSatisfiable when it is valid but no range overlaps the
+    resource.
+    """
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs:
+        return None
+
+    parts = specs.split(",")
+    if len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        match = _RANGE_SPEC.match(part)
+        if not match:
+            return None
+        first, last = match.groups()
+        if first:
+            first = int(first)
+            if last and int(last) < first:
+                return None
+            if first >= size:
+                continue
+            last = min(int(last), size - 1) if last else size - 1
+            ranges.append((first, last))
+        elif last:
+            suffix = int(last)
+            # A suffix of nothing, or of an empty resource, selects no bytes.
+            if suffix == 0 or size == 0:
+                continue
+            ranges.append((max(size - suffix, 0), size - 1))
+        else:
+            return None
+
+    if not ranges:
+        raise RangeNotSatisfiable
+    return ranges
+
+
+def if_range_matches(if_range, etag, last_modified):
+    """Whether an ``If-Range`` validator still matches the representation"""
+    if if_range.startswith('"'):
+        return if_range == etag
+    if if_range.startswith("W/"):
+        return False
+    return parse_http_date_safe(if_range) == parse_http_date_safe(last_modified)
+
+
+def make_boundary():
+    return secrets.token_hex(12)
+
+
+def multipart_parts(ranges, size, boundary, content_type):
+    """Yield ``(part header, first, last)`` for a multipart/byteranges body"""
+    for first, last in ranges:
+        header = (
+            f"--{boundary}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Range: bytes {first}-{last}/{size}\r\n\r\n"
+        ).encode("ascii")
+        yield header, first, last
+
+
+def multipart_length(ranges, size, boundary, content_type):
+    total = len(f"--{boundary}--\r\n")
+    for header, first, last in multipart_parts(ranges, size, boundary, content_type):
+        total += len(header) + (last - first + 1) + 2
+    return total
+
+
+def multipart_chunks(ranges, size, boundary, content_type):
+    for header, first, last in multipart_parts(ranges, size, boundary, content_type):
+        yield header
+        yield from pattern_chunks(first, last + 1)
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode("ascii")
@@ -0,0 +1,100 @@
+"""
+Precomputed responses for the fixed-content endpoints.
+
+Each body is rendered to bytes once, when the app is ready, together with its
+strong ETag and any gzip/deflate variant that is smaller than the original.
+Requests are then answered straight from ``PAYLOADS``.
+"""
+
+from dataclasses import dataclass, field
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+from core.encoding import COMPRESSORS, if_none_match, negotiate_encoding, strong_etag
+
+SOURCES = {
+    "json": (
+        JSONRenderer.media_type,
+        {"slideshow": {"title": "Sample Slide Show", "slides": [{"title": "Slide 1"}]}},
+    ),
+    "xml": (
+        "application/xml",
+        "<?xml version='1.0' encoding='us-ascii'?>\n"
+        "<slideshow title='Sample Slide Show'><slide title='Slide 1' /></slideshow>",
+    ),
+    "html": (
+        "text/html; charset=utf-8",
+        "<html><head><title>Sample</title></head><body><h1>Sample HTML</h1></body></html>",
+    ),
+    "utf8": (
+        "text/plain; charset=utf-8",
+        "÷ Samples: Café – 東京 — emojis 😀",
+    ),
+    "robots": (
+        "text/plain",
+        "User-agent: *\nDisallow: /deny\n",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Variant:
+    body: bytes
+    etag: str
+
+
+@dataclass(frozen=True)
+class StaticPayload:
+    content_type: str
+    identity: Variant
+    encoded: dict = field(default_factory=dict)
+
+    @property
+    def encodings(self):
+        return tuple(self.encoded)
+
+
+PAYLOADS = {}
+
+
+def _render(content):
+    if isinstance(content, str):
+        return content.encode("utf-8")
+    return JSONRenderer().render(content)
+
+
+def build_payload(content_type, content):
+    body = _render(content)
+    etag = strong_etag(body)
+    encoded = {}
+    for coding, compress in COMPRESSORS.items():
+        compressed = compress(body)
+        if len(compressed) < len(body):
+            encoded[coding] = Variant(compressed, f'{etag[:-1]}-{coding}"')
+    return StaticPayload(content_type, Variant(body, etag), encoded)
+
+
+def build_payloads():
+    PAYLOADS.update(
+        (name, build_payload(content_type, content))
+        for name, (content_type, content) in SOURCES.items()
+    )
+
+
+def serve(request, name):
+    payload = PAYLOADS[name]
+    coding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), payload.encodings)
+    variant = payload.encoded[coding] if coding else payload.identity
+
+    if if_none_match(request, variant.etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(variant.body, content_type=payload.content_type)
+        if coding:
+            response["Content-Encoding"] = coding
+    response["ETag"] = variant.etag
+    if payload.encoded:
+        patch_vary_headers(response, ("Accept-Encoding",))
+    return response
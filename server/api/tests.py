@@ -1,3 +1,202 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import io
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from auth.utils import HASH_ALGORITHMS
+
+from .uploads import DigestUploadHandler
+from .payloads import MAX_WINDOW_SIZE, RANDOM_POOL_SIZE, random_chunks
+from .views import forms_post_view
+
+
+class BytesTests(SimpleTestCase):
+    def test_unseeded_bytes_differ(self):
+        first = self.client.get("/api/bytes/16/")
+        second = self.client.get("/api/bytes/16/")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.content), 16)
+        self.assertNotEqual(first.content, second.content)
+
+    def test_seeded_bytes_match(self):
+        first = self.client.get("/api/bytes/64/?seed=42")
+        second = self.client.get("/api/bytes/64/?seed=42")
+        self.assertEqual(first.content, second.content)
+        self.assertNotEqual(first.content, self.client.get("/api/bytes/64/?seed=43").content)
+
+    def test_seeded_stream_ignores_chunk_size(self):
+        url = "/api/stream-bytes/50000/?seed=7"
+        bodies = [
+            b"".join(self.client.get(url + query).streaming_content)
+            for query in ("", "&chunk_size=999", "&chunk_size=1000", "&chunk_size=70000")
+        ]
+        self.assertEqual(len(bodies[0]), 50000)
+        self.assertEqual(len(set(bodies)), 1)
+        self.assertEqual(bodies[0], self.client.get("/api/bytes/50000/?seed=7").content)
+
+    def test_unseeded_chunks_vary_with_pool_sized_chunks(self):
+        chunks = [bytes(chunk) for chunk in random_chunks(4 * MAX_WINDOW_SIZE, RANDOM_POOL_SIZE)]
+        self.assertEqual(len(chunks), 4)
+        self.assertGreater(len(set(chunks)), 1)
+
+
+class RangeTests(SimpleTestCase):
+    def test_suffix_range_on_empty_resource_is_unsatisfiable(self):
+        response = self.client.get("/api/range/0/", HTTP_RANGE="bytes=-5")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */0")
+
+    def test_suffix_range(self):
+        response = self.client.get("/api/range/26/", HTTP_RANGE="bytes=-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 21-25/26")
+        self.assertEqual(len(b"".join(response.streaming_content)), 5)
+
+    def test_suffix_longer_than_resource(self):
+        response = self.client.get("/api/range/3/", HTTP_RANGE="bytes=-10")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 0-2/3")
+
+    def test_start_past_end_is_unsatisfiable(self):
+        response = self.client.get("/api/range/10/", HTTP_RANGE="bytes=10-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+
+class FormsPostTests(SimpleTestCase):
+    def test_upload_is_hashed_and_request_closes(self):
+        content = b"hello upload" * 100
+        request = RequestFactory().post(
+            "/api/forms/post/",
+            {"field": "value", "file": SimpleUploadedFile("a.txt", content, "text/plain")},
+        )
+        response = forms_post_view(request)
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["form"], {"field": "value"})
+        self.assertEqual(response.data["files"]["file"]["sha256"], hashlib.sha256(content).hexdigest())
+        self.assertEqual(response.data["files"]["file"]["size"], len(content))
+        request.close()
+
+
+class UploadLimitTests(SimpleTestCase):
+    url = "/api/forms/post/"
+
+    def files(self, count, size=10):
+        return {f"file{i}": SimpleUploadedFile(f"{i}.txt", b"x" * size, "text/plain") for i in range(count)}
+
+    @override_settings(HTTPBIN_UPLOAD_MAX_PARTS=2)
+    def test_too_many_parts(self):
+        self.assertEqual(self.client.post(self.url, self.files(2)).status_code, 200)
+        response = self.client.post(self.url, self.files(3))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json(), {"error": "More than 2 file parts"})
+
+    @override_settings(HTTPBIN_UPLOAD_MAX_SIZE=1000)
+    def test_request_too_large(self):
+        self.assertEqual(self.client.post(self.url, self.files(1, 100)).status_code, 200)
+        response = self.client.post(self.url, self.files(1, 2000))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json(), {"error": "Request body exceeds 1000 bytes"})
+
+    def test_file_bytes_too_large(self):
+        # Without a Content-Length the limit is enforced on the file bytes.
+        handler = DigestUploadHandler(max_size=100)
+        self.assertIsNone(handler.handle_raw_input(None, {}, None, b"boundary"))
+        handler.new_file("file", "a.txt", "text/plain", None)
+        handler.receive_data_chunk(b"x" * 60, 0)
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(b"x" * 60, 60)
+        self.assertEqual(handler.error, "Uploaded files exceed 100 bytes")
+
+
+class HashTests(SimpleTestCase):
+    body = b"hash me" * 1000
+
+    def post(self, query=""):
+        return self.client.post(f"/api/hash/{query}", self.body, content_type="application/octet-stream")
+
+    def test_defaults_to_all_algorithms(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["length"], len(self.body))
+        self.assertEqual(response.json()["digests"]["sha256"], hashlib.sha256(self.body).hexdigest())
+        self.assertEqual(list(response.json()["digests"]), list(HASH_ALGORITHMS))
+
+    def test_selected_algorithms(self):
+        response = self.post("?algorithms=MD5, sha256,md5")
+        self.assertEqual(
+            response.json()["digests"],
+            {"md5": hashlib.md5(self.body).hexdigest(), "sha256": hashlib.sha256(self.body).hexdigest()},
+        )
+
+    def test_unknown_algorithm(self):
+        response = self.post("?algorithms=md5,crc99")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Unsupported algorithms: crc99")
+
+    def test_empty_selection_is_rejected(self):
+        for query in ("?algorithms=", "?algorithms=,", "?algorithms=%20,%20"):
+            with self.subTest(query=query):
+                response = self.post(query)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["error"], "No algorithms selected")
+
+
+class SinkTests(SimpleTestCase):
+    body = b"x" * 300_000
+
+    def test_upload_with_content_length(self):
+        response = self.client.post("/api/sink/", self.body, content_type="application/octet-stream")
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()
+        self.assertEqual(stats["bytes"], len(self.body))
+        self.assertGreaterEqual(stats["chunks"], 1)
+        self.assertFalse(stats["chunked"])
+
+    def test_chunked_upload(self):
+        environ = {"wsgi.input": io.BytesIO(self.body), "wsgi.input_terminated": True}
+        response = self.client.put(
+            "/api/sink/", self.body, content_type="application/octet-stream", CONTENT_LENGTH="", **environ
+        )
+        stats = response.json()
+        self.assertEqual(stats["bytes"], len(self.body))
+        self.assertTrue(stats["chunked"])
+
+    def test_encoded_upload_is_not_decoded(self):
+        body = gzip.compress(self.body)
+        response = self.client.post(
+            "/api/sink/", body, content_type="application/octet-stream", HTTP_CONTENT_ENCODING="gzip"
+        )
+        self.assertEqual(response.json()["bytes"], len(body))
+
+    def test_get_is_not_allowed(self):
+        self.assertEqual(self.client.get("/api/sink/").status_code, 405)
+
+
+class SchemaTests(SimpleTestCase):
+    # Plain (non-DRF) views that are still documented through core.fastpath.documented.
+    documented = {
+        "/api/json/": "",
+        "/api/xml/": "XML",
+        "/api/html/": "HTML",
+        "/api/encoding/utf8/": "UTF-8 text",
+        "/api/robots.txt/": "text/plain",
+        "/api/drip/": "stream",
+        "/api/delay/{seconds}/": "",
+        "/api/stream/{lines}/": "stream",
+    }
+
+    def test_plain_views_are_documented(self):
+        paths = self.client.get("/swagger/?format=openapi").json()["paths"]
+        for path, description in self.documented.items():
+            with self.subTest(path=path):
+                self.assertEqual(list(paths[path]), ["get", "parameters"])
+                self.assertEqual(paths[path]["get"]["responses"]["200"]["description"], description)
+
+    def test_drip_query_parameters(self):
+        operation = self.client.get("/swagger/?format=openapi").json()["paths"]["/api/drip/"]["get"]
+        self.assertEqual([param["name"] for param in operation["parameters"]], ["duration", "numbytes"])
@@ -0,0 +1,85 @@
+"""
+Streaming upload handling for ``forms_post_view``.
+
+``DigestUploadHandler`` replaces Django's memory/temporary-file handlers for
+that view: each file part is counted and hashed as it streams past and only
+its size and digest are kept, so uploads are never buffered or written to
+disk.
+"""
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+from auth.utils import new_hasher
+
+UPLOAD_DIGEST = "sha256"
+
+
+class DigestedFile(UploadedFile):
+    """A received file part reduced to its metadata and digest"""
+
+    def __init__(self, name, content_type, size, charset, digest):
+        super().__init__(None, name, content_type, size, charset)
+        self.digest = digest
+
+    def close(self):
+        # Nothing was stored; HttpRequest.close() still calls this per file.
+        pass
+
+    def describe(self):
+        return {
+            "filename": self.name,
+            "content_type": self.content_type,
+            "size": self.size,
+            UPLOAD_DIGEST: self.digest,
+        }
+
+
+class DigestUploadHandler(FileUploadHandler):
+    """
+    Hash file parts without storing them.
+
+    At most ``HTTPBIN_UPLOAD_MAX_PARTS`` file parts and
+    ``HTTPBIN_UPLOAD_MAX_SIZE`` request bytes are accepted. Past either limit
+    parsing stops, the rest of the body is discarded and ``error`` says why.
+    """
+
+    chunk_size = 64 * 2**10
+
+    def __init__(self, request=None, max_parts=None, max_size=None):
+        super().__init__(request)
+        self.max_parts = settings.HTTPBIN_UPLOAD_MAX_PARTS if max_parts is None else max_parts
+        self.max_size = settings.HTTPBIN_UPLOAD_MAX_SIZE if max_size is None else max_size
+        self.parts = 0
+        self.received = 0
+        self.error = None
+        self.hasher = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length is not None and content_length > self.max_size:
+            self.error = f"Request body exceeds {self.max_size} bytes"
+            # Returning a result tells the parser the body has been handled.
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.parts += 1
+        if self.parts > self.max_parts:
+            self.error = f"More than {self.max_parts} file parts"
+            raise StopUpload(connection_reset=False)
+        self.hasher = new_hasher(UPLOAD_DIGEST)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.error = f"Uploaded files exceed {self.max_size} bytes"
+            raise StopUpload(connection_reset=False)
+        self.hasher.update(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        return DigestedFile(self.file_name, self.content_type, file_size, self.charset, self.hasher.hexdigest())
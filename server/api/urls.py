@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import home, health_check, json_view, xml_view, html_view, utf8_view, bytes_view, drip_view, delay_view, stream_view, range_view, gzip_view, deflate_view, base64_view, links_view, cache_view, forms_post_view, robots_txt
+from .views import home, health_check, json_view, xml_view, html_view, utf8_view, bytes_view, stream_bytes_view, drip_view, delay_view, stream_view, range_view, gzip_view, deflate_view, base64_view, links_view, cache_view, forms_post_view, sink_view, hash_view, robots_txt
 
 urlpatterns = [
     path("", home, name="home"),
@@ -10,6 +10,7 @@ urlpatterns = [
     path("html/", html_view, name="html"),
     path("encoding/utf8/", utf8_view, name="utf8"),
     path("bytes/<int:n>/", bytes_view, name="bytes"),
+    path("stream-bytes/<int:n>/", stream_bytes_view, name="stream-bytes"),
     path("drip/", drip_view, name="drip"),
     path("delay/<int:seconds>/", delay_view, name="delay"),
     path("stream/<int:lines>/", stream_view, name="stream"),
@@ -20,5 +21,7 @@ urlpatterns = [
     path("links/<int:n>/", links_view, name="links"),
     path("cache/", cache_view, name="cache"),
     path("forms/post/", forms_post_view, name="forms-post"),
+    path("sink/", sink_view, name="sink"),
+    path("hash/", hash_view, name="hash"),
     path("robots.txt/", robots_txt, name="robots-txt"),
 ]
@@ -1,18 +1,37 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import HttpResponse, StreamingHttpResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils.encoding import smart_str
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods, require_safe
+import asyncio
 import base64 as b64
 import json
 import time
 import zlib
 import gzip as gz
 import io
-import os
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from auth.utils import HASH_ALGORITHMS, new_hasher
+from core.bodies import digest_body, drain_body
+from core.fastpath import documented
+from core.streaming import is_asgi, streaming_response
+from . import static_responses
+from .uploads import DigestUploadHandler
+from .payloads import DEFAULT_CHUNK_SIZE, random_bytes, random_chunks
+from .ranges import (
+    LAST_MODIFIED,
+    RangeNotSatisfiable,
+    if_range_matches,
+    make_boundary,
+    multipart_chunks,
+    multipart_length,
+    parse_range_header,
+    pattern_chunks,
+    resource_etag,
+)
 
 # Create your views here.
 
@@ -29,86 +48,196 @@ def health_check(request):
     return Response({"status": "healthy"}, status=status.HTTP_200_OK)
 
 
-@swagger_auto_schema(method='get', responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)})
-@api_view(["GET"])
+# The fixed-content endpoints skip DRF entirely and answer from the table
+# built in ApiConfig.ready(), including 304s for matching If-None-Match.
+
+
+@documented('get', responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)})
+@require_safe
 def json_view(request):
-    data = {"slideshow": {"title": "Sample Slide Show", "slides": [{"title": "Slide 1"}]}}
-    return Response(data)
+    return static_responses.serve(request, "json")
 
 
-@swagger_auto_schema(method='get', responses={200: 'XML'})
-@api_view(["GET"])
+@documented('get', responses={200: 'XML'})
+@require_safe
 def xml_view(request):
-    xml = """<?xml version='1.0' encoding='us-ascii'?>\n<slideshow title='Sample Slide Show'><slide title='Slide 1' /></slideshow>"""
-    return HttpResponse(xml, content_type="application/xml")
+    return static_responses.serve(request, "xml")
 
 
-@swagger_auto_schema(method='get', responses={200: 'HTML'})
-@api_view(["GET"])
+@documented('get', responses={200: 'HTML'})
+@require_safe
 def html_view(request):
-    html = """<html><head><title>Sample</title></head><body><h1>Sample HTML</h1></body></html>"""
-    return HttpResponse(html, content_type="text/html; charset=utf-8")
+    return static_responses.serve(request, "html")
 
 
-@swagger_auto_schema(method='get', responses={200: 'UTF-8 text'})
-@api_view(["GET"])
+@documented('get', responses={200: 'UTF-8 text'})
+@require_safe
 def utf8_view(request):
-    content = "÷ Samples: Café – 東京 — emojis 😀"
-    return HttpResponse(content, content_type="text/plain; charset=utf-8")
+    return static_responses.serve(request, "utf8")
+
 
+def _optional_int(request, name):
+    value = request.GET.get(name)
+    return int(value) if value not in (None, "") else None
 
-@swagger_auto_schema(method='get', responses={200: 'binary'})
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter('seed', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+    ],
+    responses={200: 'binary'}
+)
 @api_view(["GET"])
 def bytes_view(request, n: int):
-    rng = os.urandom(n)
-    return HttpResponse(rng, content_type="application/octet-stream")
+    try:
+        seed = _optional_int(request, "seed")
+    except ValueError:
+        return Response({"error": "seed must be an integer"}, status=400)
+    return HttpResponse(random_bytes(n, seed), content_type="application/octet-stream")
 
 
 @swagger_auto_schema(
     method='get',
     manual_parameters=[
-        openapi.Parameter('duration', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False),
-        openapi.Parameter('numbytes', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('seed', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('chunk_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
     ],
     responses={200: 'stream'}
 )
 @api_view(["GET"])
-def drip_view(request):
+def stream_bytes_view(request, n: int):
+    try:
+        seed = _optional_int(request, "seed")
+        chunk_size = _optional_int(request, "chunk_size")
+    except ValueError:
+        return Response({"error": "seed and chunk_size must be integers"}, status=400)
+    if chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE
+    elif chunk_size < 1:
+        return Response({"error": "chunk_size must be positive"}, status=400)
+
+    response = streaming_response(request, random_chunks(n, chunk_size, seed), "application/octet-stream")
+    response["Content-Length"] = str(n)
+    return response
+
+
+def _drip(numbytes, interval):
+    for _ in range(numbytes):
+        time.sleep(interval)
+        yield b"*"
+
+
+async def _adrip(numbytes, interval):
+    for _ in range(numbytes):
+        await asyncio.sleep(interval)
+        yield b"*"
+
+
+def _json_lines(lines):
+    for i in range(lines):
+        yield json.dumps({"line": i}) + "\n"
+        time.sleep(0.05)
+
+
+async def _ajson_lines(lines):
+    for i in range(lines):
+        yield json.dumps({"line": i}) + "\n"
+        await asyncio.sleep(0.05)
+
+
+# The slow endpoints below are native async views. Under ASGI (server/asgi.py)
+# they park on the event loop instead of holding a worker thread; under WSGI
+# Django runs them through async_to_sync and they behave as before. The body
+# generator is picked per server type because StreamingHttpResponse buffers
+# an iterator of the "wrong" kind completely before sending it.
+
+
+@documented(
+    'get',
+    manual_parameters=[
+        openapi.Parameter('duration', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False),
+        openapi.Parameter('numbytes', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+    ],
+    responses={200: 'stream'},
+)
+@require_safe
+async def drip_view(request):
     duration = float(request.GET.get("duration", "1"))
     numbytes = int(request.GET.get("numbytes", "10"))
     interval = duration / max(numbytes, 1)
 
-    def generator():
-        for _ in range(numbytes):
-            time.sleep(interval)
-            yield b"*"
+    if is_asgi(request):
+        generator = _adrip(numbytes, interval)
+    else:
+        generator = _drip(numbytes, interval)
+    return StreamingHttpResponse(generator, content_type="application/octet-stream")
 
-    return StreamingHttpResponse(generator(), content_type="application/octet-stream")
 
+@documented('get', responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)})
+@require_safe
+async def delay_view(request, seconds: int):
+    await asyncio.sleep(seconds)
+    return JsonResponse({"delay": seconds, "status": "done"})
 
-@swagger_auto_schema(method='get', responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)})
-@api_view(["GET"])
-def delay_view(request, seconds: int):
-    time.sleep(seconds)
-    return Response({"delay": seconds, "status": "done"})
-
-
-@swagger_auto_schema(method='get', responses={200: 'stream'})
-@api_view(["GET"])
-def stream_view(request, lines: int):
-    def generator():
-        for i in range(lines):
-            yield json.dumps({"line": i}) + "\n"
-            time.sleep(0.05)
 
-    return StreamingHttpResponse(generator(), content_type="application/json")
+@documented('get', responses={200: 'stream'})
+@require_safe
+async def stream_view(request, lines: int):
+    if is_asgi(request):
+        generator = _ajson_lines(lines)
+    else:
+        generator = _json_lines(lines)
+    return StreamingHttpResponse(generator, content_type="application/json")
 
 
-@swagger_auto_schema(method='get', responses={200: 'binary'})
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter('Range', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('If-Range', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False),
+    ],
+    responses={200: 'binary', 206: 'partial content', 416: 'range not satisfiable'}
+)
 @api_view(["GET"])
 def range_view(request, num: int):
-    data = bytes(range(0, num % 256)) * (num // 256) + bytes(range(0, num % 256))[: num % 256]
-    return HttpResponse(data, content_type="application/octet-stream")
+    content_type = "application/octet-stream"
+    etag = resource_etag(num)
+    ranges = None
+
+    range_header = request.META.get("HTTP_RANGE")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if range_header and (not if_range or if_range_matches(if_range, etag, LAST_MODIFIED)):
+        try:
+            ranges = parse_range_header(range_header, num)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{num}"
+            response["Accept-Ranges"] = "bytes"
+            return response
+
+    if ranges is None:
+        response = streaming_response(request, pattern_chunks(0, num), content_type)
+        response["Content-Length"] = str(num)
+    elif len(ranges) == 1:
+        first, last = ranges[0]
+        response = streaming_response(request, pattern_chunks(first, last + 1), content_type, status=206)
+        response["Content-Range"] = f"bytes {first}-{last}/{num}"
+        response["Content-Length"] = str(last - first + 1)
+    else:
+        boundary = make_boundary()
+        response = streaming_response(
+            request,
+            multipart_chunks(ranges, num, boundary, content_type),
+            f"multipart/byteranges; boundary={boundary}",
+            status=206,
+        )
+        response["Content-Length"] = str(multipart_length(ranges, num, boundary, content_type))
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = LAST_MODIFIED
+    return response
 
 
 @swagger_auto_schema(method='get', responses={200: 'gzip'})
@@ -155,11 +284,47 @@ def cache_view(request):
 @swagger_auto_schema(method='post', responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)})
 @api_view(["POST"])
 def forms_post_view(request):
-    return Response({"form": request.POST.dict(), "files": {k: f.name for k, f in request.FILES.items()}})
-
-
-@swagger_auto_schema(method='get', responses={200: 'text/plain'})
-@api_view(["GET"])
+    # Files are hashed as they stream in instead of being kept in memory or
+    # spooled to temporary files; see api.uploads.
+    handler = DigestUploadHandler(request._request)
+    request._request.upload_handlers = [handler]
+    form = request.POST.dict()
+    if handler.error:
+        return Response({"error": handler.error}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    return Response({"form": form, "files": {k: f.describe() for k, f in request.FILES.items()}})
+
+
+# Under ASGI, server.asgi answers this route before Django sees the request
+# (core.asgi.BodySinkApplication); this view serves it under WSGI.
+@csrf_exempt
+@require_http_methods(["POST", "PUT", "PATCH"])
+def sink_view(request):
+    return JsonResponse(drain_body(request))
+
+
+@csrf_exempt
+@require_http_methods(["POST", "PUT"])
+def hash_view(request):
+    """
+    Digests of the raw request body, computed in a single streaming pass.
+    ``?algorithms=md5,sha256`` selects hashers (default: all supported); an
+    empty selection is rejected.
+    """
+    requested = request.GET.get("algorithms")
+    if requested is None:
+        names = list(HASH_ALGORITHMS)
+    else:
+        names = [name.strip().lower() for name in requested.split(",") if name.strip()]
+    unknown = [name for name in names if name not in HASH_ALGORITHMS]
+    if unknown or not names:
+        error = f"Unsupported algorithms: {', '.join(unknown)}" if unknown else "No algorithms selected"
+        return JsonResponse({"error": error, "supported": list(HASH_ALGORITHMS)}, status=400)
+    hashers = {name: new_hasher(name) for name in dict.fromkeys(names)}
+    length = digest_body(request, hashers)
+    return JsonResponse({"length": length, "digests": {name: h.hexdigest() for name, h in hashers.items()}})
+
+
+@documented('get', responses={200: 'text/plain'})
+@require_safe
 def robots_txt(request):
-    content = "User-agent: *\nDisallow: /deny\n"
-    return HttpResponse(content, content_type="text/plain")
+    return static_responses.serve(request, "robots")
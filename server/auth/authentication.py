@@ -1,6 +1,7 @@
-import base64
 from rest_framework import authentication, exceptions
 
+from .utils import decode_basic_credentials, parse_digest_header
+
 
 class HTTPBinBasicAuthentication(authentication.BaseAuthentication):
     """
@@ -13,10 +14,8 @@ class HTTPBinBasicAuthentication(authentication.BaseAuthentication):
             return None
 
         try:
-            credentials = base64.b64decode(auth_header[6:]).decode("utf-8")
-            username, password = credentials.split(":", 1)
-            return (username, password), None
-        except (ValueError, UnicodeDecodeError):
+            return decode_basic_credentials(auth_header[6:]), None
+        except ValueError:
             raise exceptions.AuthenticationFailed("Invalid basic auth credentials")
 
 
@@ -40,16 +39,15 @@ class HTTPBinDigestAuthentication(authentication.BaseAuthentication):
     """
 
     def authenticate(self, request):
-        auth_header = request.META.get("HTTP_AUTHORIZATION")
-        if not auth_header or not auth_header.startswith("Digest "):
+        auth_header = request.META.get("HTTP_AUTHORIZATION", "")
+        scheme, _, params = auth_header.partition(" ")
+        if scheme.lower() != "digest":
             return None
 
-        # Parse digest auth header
-        auth_dict = {}
-        auth_header = auth_header[7:]  # Remove 'Digest '
-
-        for item in auth_header.split(", "):
-            key, value = item.split("=", 1)
-            auth_dict[key] = value.strip('"')
+        # A malformed header is treated like a missing one, so the client
+        # gets a fresh challenge.
+        auth_dict = parse_digest_header(params)
+        if auth_dict is None:
+            return None
 
         return (auth_dict.get("username"), auth_dict), None
@@ -0,0 +1,150 @@
+"""
+Nonce bookkeeping for digest auth.
+
+Every nonce handed out in a challenge is recorded with its issue time, the
+highest ``nc`` seen so far and how many requests used it. ``use()`` then tells
+the view whether a correctly computed response is valid, replayed (``nc`` did
+not increase) or stale (expired, evicted, unknown or past ``stale_after``
+uses), in which case the client gets a fresh challenge with ``stale=true``.
+
+``NonceStore`` keeps at most ``HTTPBIN_DIGEST_NONCE_MAX_ENTRIES`` nonces in
+process: an OrderedDict in least-recently-used order, so eviction and TTL
+purging pop from the front in O(1). Setting ``HTTPBIN_DIGEST_NONCE_CACHE`` to
+a cache alias uses ``CacheNonceStore`` instead, shared by every worker.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+NONCE_VALID = "valid"
+NONCE_STALE = "stale"
+NONCE_REPLAYED = "replayed"
+
+# Entry layout: [issued_at, highest nc, uses]
+_ISSUED, _NC, _USES = range(3)
+
+
+def _new_entry(now):
+    return [now, -1, 0]
+
+
+def _apply_use(entry, nc, stale_after):
+    """Record one use of ``entry``; returns the verdict"""
+    if nc is not None:
+        if nc <= entry[_NC]:
+            return NONCE_REPLAYED
+        entry[_NC] = nc
+    entry[_USES] += 1
+    if stale_after is not None and entry[_USES] > stale_after:
+        return NONCE_STALE
+    return NONCE_VALID
+
+
+class NonceStore:
+    """Bounded in-process nonce store with TTL and LRU eviction"""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def issue(self):
+        nonce = secrets.token_hex(16)
+        now = time.monotonic()
+        with self._lock:
+            self._entries[nonce] = _new_entry(now)
+            self._purge(now)
+        return nonce
+
+    def use(self, nonce, nc=None, stale_after=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(nonce)
+            if entry is None:
+                return NONCE_STALE
+            if now - entry[_ISSUED] > self.ttl:
+                del self._entries[nonce]
+                return NONCE_STALE
+            verdict = _apply_use(entry, nc, stale_after)
+            if verdict == NONCE_STALE:
+                del self._entries[nonce]
+            else:
+                self._entries.move_to_end(nonce)
+            return verdict
+
+    def _purge(self, now):
+        # Least recently used first: drop expired entries from the front until
+        # a live one is found, then enforce the size bound.
+        entries = self._entries
+        while entries:
+            nonce = next(iter(entries))
+            if now - entries[nonce][_ISSUED] <= self.ttl:
+                break
+            del entries[nonce]
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+class CacheNonceStore:
+    """
+    Nonce store on a Django cache shared between workers.
+
+    Expiry and eviction are left to the cache backend. Updates are
+    read-modify-write, so two workers racing on the same nonce may both
+    accept it; use the in-process store when replay detection must be exact.
+    """
+
+    key_prefix = "httpbin:digest-nonce:"
+
+    def __init__(self, cache, ttl):
+        self.cache = cache
+        self.ttl = ttl
+
+    def issue(self):
+        nonce = secrets.token_hex(16)
+        self.cache.set(self.key_prefix + nonce, _new_entry(time.time()), self.ttl)
+        return nonce
+
+    def use(self, nonce, nc=None, stale_after=None):
+        key = self.key_prefix + nonce
+        entry = self.cache.get(key)
+        if entry is None:
+            return NONCE_STALE
+        remaining = self.ttl - (time.time() - entry[_ISSUED])
+        if remaining <= 0:
+            self.cache.delete(key)
+            return NONCE_STALE
+        verdict = _apply_use(entry, nc, stale_after)
+        if verdict == NONCE_STALE:
+            self.cache.delete(key)
+        elif verdict == NONCE_VALID:
+            self.cache.set(key, entry, remaining)
+        return verdict
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_nonce_store():
+    """The configured nonce store, created on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                alias = getattr(settings, "HTTPBIN_DIGEST_NONCE_CACHE", None)
+                ttl = settings.HTTPBIN_DIGEST_NONCE_TTL
+                if alias:
+                    _store = CacheNonceStore(caches[alias], ttl)
+                else:
+                    _store = NonceStore(ttl, settings.HTTPBIN_DIGEST_NONCE_MAX_ENTRIES)
+    return _store
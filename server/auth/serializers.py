@@ -1,5 +1,8 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from .tokens import JWT_ALGORITHMS
+
 
 class AuthResponseSerializer(serializers.Serializer):
     authenticated = serializers.BooleanField()
@@ -19,3 +22,20 @@ class TokenValidationResponseSerializer(serializers.Serializer):
     token = serializers.CharField()
     method = serializers.CharField()
     details = serializers.DictField(required=False)
+
+
+class JWTIssueSerializer(serializers.Serializer):
+    claims = serializers.DictField(required=False, default=dict)
+    algorithm = serializers.ChoiceField(choices=JWT_ALGORITHMS, default="HS256")
+    expires_in = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_expires_in(self, value):
+        if value > settings.HTTPBIN_JWT_MAX_LIFETIME:
+            raise serializers.ValidationError(
+                f"Ensure this value is less than or equal to {settings.HTTPBIN_JWT_MAX_LIFETIME}."
+            )
+        return value
+
+
+class JWTVerifySerializer(serializers.Serializer):
+    token = serializers.CharField()
@@ -1,3 +1,437 @@
-from django.test import TestCase
+import base64
+import hashlib
+import json
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, override_settings
+
+from .nonces import NONCE_REPLAYED, NONCE_STALE, NONCE_VALID, CacheNonceStore, NonceStore
+from .tokens import TokenError, get_verification_cache, issue_token, verify_token
+from .utils import credentials_match, decode_basic_credentials, parse_digest_header
+
+BATCH_URL = "/auth/validate-token/batch/"
+ISSUE_URL = "/auth/jwt/issue/"
+VERIFY_URL = "/auth/jwt/verify/"
+DIGEST_URL = "/auth/digest-auth/auth/user/passwd/MD5/never/"
+
+
+def basic(credentials):
+    return "Basic " + base64.b64encode(credentials).decode()
+
+
+class BasicCredentialTests(SimpleTestCase):
+    def setUp(self):
+        decode_basic_credentials.cache_clear()
+
+    def test_decode(self):
+        self.assertEqual(decode_basic_credentials(base64.b64encode(b"user:pa:ss").decode()), ("user", "pa:ss"))
+
+    def test_decode_errors(self):
+        for encoded in ("not base64!", base64.b64encode(b"no-colon").decode(), base64.b64encode(b"\xff:x").decode()):
+            with self.subTest(encoded=encoded):
+                with self.assertRaises(ValueError):
+                    decode_basic_credentials(encoded)
+
+    def test_cache_is_keyed_by_header(self):
+        alice = base64.b64encode(b"alice:one").decode()
+        bob = base64.b64encode(b"bob:two").decode()
+        self.assertEqual(decode_basic_credentials(alice), ("alice", "one"))
+        self.assertEqual(decode_basic_credentials(bob), ("bob", "two"))
+        self.assertEqual(decode_basic_credentials(alice), ("alice", "one"))
+        info = decode_basic_credentials.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
+
+    def test_credentials_match(self):
+        self.assertTrue(credentials_match("user", "passwd", "user", "passwd"))
+        self.assertFalse(credentials_match("user", "wrong", "user", "passwd"))
+        self.assertFalse(credentials_match("other", "passwd", "user", "passwd"))
+        self.assertFalse(credentials_match("us\u00e9r", "passwd", "user", "passwd"))
+
+
+class BasicAuthViewTests(SimpleTestCase):
+    url = "/auth/basic-auth/user/passwd/"
+    hidden_url = "/auth/hidden-basic-auth/user/passwd/"
+
+    def test_success(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=basic(b"user:passwd"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"], "user")
+        self.assertTrue(response.json()["authenticated"])
+
+    def test_missing_and_wrong_credentials(self):
+        for headers in ({}, {"HTTP_AUTHORIZATION": basic(b"user:wrong")}, {"HTTP_AUTHORIZATION": basic(b"x:passwd")}):
+            with self.subTest(headers=headers):
+                response = self.client.get(self.url, **headers)
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response["WWW-Authenticate"], 'Basic realm="HTTPBin"')
+
+    def test_malformed_credentials(self):
+        for header in ("Basic not base64!", basic(b"no-colon"), basic(b"\xff\xfe:passwd")):
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_AUTHORIZATION=header)
+                self.assertEqual(response.status_code, 403)
+                self.assertEqual(response.json()["detail"], "Invalid basic auth credentials")
+
+    def test_hidden_basic(self):
+        response = self.client.get(self.hidden_url, HTTP_AUTHORIZATION=basic(b"user:passwd"))
+        self.assertEqual(response.status_code, 200)
+        for headers in ({}, {"HTTP_AUTHORIZATION": basic(b"user:wrong")}):
+            with self.subTest(headers=headers):
+                response = self.client.get(self.hidden_url, **headers)
+                self.assertEqual(response.status_code, 404)
+                self.assertFalse(response.has_header("WWW-Authenticate"))
+
+    def test_bearer(self):
+        response = self.client.get("/auth/bearer/", HTTP_AUTHORIZATION="Bearer abc")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["token"], "abc")
+        self.assertEqual(self.client.get("/auth/bearer/").status_code, 401)
+
+
+class DigestHeaderParsingTests(SimpleTestCase):
+    def test_common_header(self):
+        params = 'username="user", realm="HTTPBin", nonce="abc", algorithm=MD5, qop=auth, nc=00000001'
+        self.assertEqual(
+            parse_digest_header(params),
+            {
+                "username": "user",
+                "realm": "HTTPBin",
+                "nonce": "abc",
+                "algorithm": "MD5",
+                "qop": "auth",
+                "nc": "00000001",
+            },
+        )
+
+    def test_quoted_commas_and_escapes(self):
+        params = r'uri="/a,b?c=d, e", realm="say \"hi\"", Nonce="x"'
+        self.assertEqual(parse_digest_header(params), {"uri": "/a,b?c=d, e", "realm": 'say "hi"', "nonce": "x"})
+
+    def test_separators_without_spaces_and_empty_elements(self):
+        self.assertEqual(parse_digest_header(',a="1",b=2 ,, c = "3", ,'), {"a": "1", "b": "2", "c": "3"})
+
+    def test_extended_username(self):
+        params = "username*=UTF-8''J%C3%A4s%C3%B8n, realm=\"r\""
+        self.assertEqual(parse_digest_header(params)["username"], "J\u00e4s\u00f8n")
+
+    def test_malformed(self):
+        for params in ("username", 'a="unterminated', "a=1 b=2", 'a="x"y', "a b=1"):
+            with self.subTest(params=params):
+                self.assertIsNone(parse_digest_header(params))
+
+
+class NonceStoreTestMixin:
+    # Concrete classes define make_store(ttl=60, max_entries=...) and name the
+    # time function the store reads its clock from.
+    clock = None
+
+    def later(self, seconds):
+        now = getattr(time, self.clock)()
+        return mock.patch(f"auth.nonces.time.{self.clock}", return_value=now + seconds)
+
+    def test_valid_use(self):
+        store = self.make_store()
+        nonce = store.issue()
+        self.assertEqual(store.use(nonce, 1), NONCE_VALID)
+        self.assertEqual(store.use(nonce, 2), NONCE_VALID)
+
+    def test_unknown_nonce_is_stale(self):
+        self.assertEqual(self.make_store().use("unknown", 1), NONCE_STALE)
+
+    def test_expired_nonce_is_stale(self):
+        store = self.make_store(ttl=60)
+        nonce = store.issue()
+        with self.later(61):
+            self.assertEqual(store.use(nonce, 1), NONCE_STALE)
+        self.assertEqual(store.use(nonce, 2), NONCE_STALE)
+
+    def test_repeated_nc_is_replayed(self):
+        store = self.make_store()
+        nonce = store.issue()
+        self.assertEqual(store.use(nonce, 5), NONCE_VALID)
+        self.assertEqual(store.use(nonce, 5), NONCE_REPLAYED)
+        self.assertEqual(store.use(nonce, 4), NONCE_REPLAYED)
+        self.assertEqual(store.use(nonce, 6), NONCE_VALID)
+
+    def test_stale_after_use_count(self):
+        store = self.make_store()
+        nonce = store.issue()
+        self.assertEqual(store.use(nonce, 1, stale_after=2), NONCE_VALID)
+        self.assertEqual(store.use(nonce, 2, stale_after=2), NONCE_VALID)
+        self.assertEqual(store.use(nonce, 3, stale_after=2), NONCE_STALE)
+        self.assertEqual(store.use(nonce, 4, stale_after=2), NONCE_STALE)
+
+
+class NonceStoreTests(NonceStoreTestMixin, SimpleTestCase):
+    clock = "monotonic"
+
+    def make_store(self, ttl=60, max_entries=100):
+        return NonceStore(ttl, max_entries)
+
+    def test_least_recently_used_is_evicted(self):
+        store = self.make_store(max_entries=2)
+        first, second = store.issue(), store.issue()
+        self.assertEqual(store.use(first, 1), NONCE_VALID)
+        third = store.issue()
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.use(second, 1), NONCE_STALE)
+        self.assertEqual(store.use(first, 2), NONCE_VALID)
+        self.assertEqual(store.use(third, 1), NONCE_VALID)
+
+    def test_expired_entries_are_purged_on_issue(self):
+        store = self.make_store(ttl=60)
+        store.issue()
+        with self.later(61):
+            store.issue()
+        self.assertEqual(len(store), 1)
+
+
+class CacheNonceStoreTests(NonceStoreTestMixin, SimpleTestCase):
+    clock = "time"
+
+    def make_store(self, ttl=60, max_entries=None):
+        cache = LocMemCache(self.id(), {})
+        self.addCleanup(cache.clear)
+        return CacheNonceStore(cache, ttl)
+
+
+class DigestAuthTests(SimpleTestCase):
+    def authorization(self, nonce, nc, url=DIGEST_URL, algorithm="MD5"):
+        hash_func = {"MD5": hashlib.md5, "SHA-256": hashlib.sha256}[algorithm]
+        ha1 = hash_func(b"user:HTTPBin:passwd").hexdigest()
+        ha2 = hash_func(f"GET:{url}".encode()).hexdigest()
+        response = hash_func(f"{ha1}:{nonce}:{nc}:cnonce:auth:{ha2}".encode()).hexdigest()
+        return (
+            f'Digest username="user",realm="HTTPBin",nonce="{nonce}",uri="{url}",'
+            f'algorithm={algorithm},qop=auth,nc={nc},cnonce="cnonce",response="{response}"'
+        )
+
+    def nonce(self, url=DIGEST_URL):
+        challenge = self.client.get(url)
+        self.assertEqual(challenge.status_code, 401)
+        return re.search(r'nonce="([^"]+)"', challenge["WWW-Authenticate"]).group(1)
+
+    def test_challenge_and_response(self):
+        nonce = self.nonce()
+        response = self.client.get(DIGEST_URL, HTTP_AUTHORIZATION=self.authorization(nonce, "00000001"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"], "user")
+
+    def test_challenged_algorithm(self):
+        url = "/auth/digest-auth/auth/user/passwd/SHA-256/never/"
+        nonce = self.nonce(url)
+        authorization = self.authorization(nonce, "00000001", url, "SHA-256")
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION=authorization).status_code, 200)
+
+    def test_algorithm_downgrade_is_rejected(self):
+        url = "/auth/digest-auth/auth/user/passwd/SHA-256/never/"
+        nonce = self.nonce(url)
+        response = self.client.get(url, HTTP_AUTHORIZATION=self.authorization(nonce, "00000001", url, "MD5"))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('algorithm="SHA-256"', response["WWW-Authenticate"])
+
+    def test_replayed_nc_is_rejected(self):
+        authorization = self.authorization(self.nonce(), "00000001")
+        self.assertEqual(self.client.get(DIGEST_URL, HTTP_AUTHORIZATION=authorization).status_code, 200)
+        response = self.client.get(DIGEST_URL, HTTP_AUTHORIZATION=authorization)
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("stale=true", response["WWW-Authenticate"])
+
+    def test_nonce_goes_stale_after_uses(self):
+        url = "/auth/digest-auth/auth/user/passwd/MD5/1/"
+        nonce = self.nonce(url)
+        first = self.client.get(url, HTTP_AUTHORIZATION=self.authorization(nonce, "00000001", url))
+        self.assertEqual(first.status_code, 200)
+        second = self.client.get(url, HTTP_AUTHORIZATION=self.authorization(nonce, "00000002", url))
+        self.assertEqual(second.status_code, 401)
+        self.assertIn("stale=true", second["WWW-Authenticate"])
+
+    def test_malformed_header_gets_a_fresh_challenge(self):
+        response = self.client.get(DIGEST_URL, HTTP_AUTHORIZATION="Digest garbage")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("nonce=", response["WWW-Authenticate"])
+
+
+class JWTTests(SimpleTestCase):
+    def setUp(self):
+        get_verification_cache().clear()
+        self.addCleanup(get_verification_cache().clear)
+
+    def issue(self, body):
+        return self.client.post(ISSUE_URL, json.dumps(body), content_type="application/json")
+
+    def verify(self, token):
+        return self.client.get(VERIFY_URL, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def assertRejected(self, response, error):
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer error="invalid_token"')
+        self.assertEqual(response.json(), {"valid": False, "error": error})
+
+    def test_issue_and_verify(self):
+        issued = self.issue({"claims": {"sub": "alice"}, "expires_in": 60})
+        self.assertEqual(issued.status_code, 200)
+        data = issued.json()
+        self.assertEqual(data["claims"]["exp"] - data["claims"]["iat"], 60)
+
+        first = self.verify(data["token"])
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), {"valid": True, "claims": data["claims"], "cached": False})
+        self.assertTrue(self.verify(data["token"]).json()["cached"])
+
+        posted = self.client.post(VERIFY_URL, {"token": data["token"]}, content_type="application/json")
+        self.assertEqual(posted.json()["claims"]["sub"], "alice")
+
+    def test_expires_in_is_capped(self):
+        limit = settings.HTTPBIN_JWT_MAX_LIFETIME
+        self.assertEqual(self.issue({"expires_in": limit}).status_code, 200)
+        response = self.issue({"expires_in": limit + 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("expires_in", response.json())
+
+    def test_expired_token(self):
+        token, _ = issue_token({"sub": "alice"}, expires_in=-10)
+        self.assertRejected(self.verify(token), "Token is expired")
+
+    def test_not_yet_valid_token(self):
+        token, _ = issue_token({"sub": "alice", "nbf": int(time.time()) + 60})
+        self.assertRejected(self.verify(token), "Token is invalid")
+
+    def test_bad_signature(self):
+        token = jwt.encode({"sub": "alice", "exp": int(time.time()) + 60}, "another-signing-key-of-at-least-32-bytes", algorithm="HS256")
+        self.assertRejected(self.verify(token), "Token is invalid")
+
+    def test_malformed_token(self):
+        self.assertRejected(self.verify("not-a-jwt"), "Token is malformed")
+
+    def test_rejections_are_not_cached(self):
+        token, _ = issue_token({"sub": "alice", "nbf": int(time.time()) + 60})
+        with self.assertRaises(TokenError):
+            verify_token(token)
+        self.assertEqual(len(get_verification_cache()), 0)
+
+    def test_cached_entry_stops_verifying_after_exp(self):
+        token, payload = issue_token({"sub": "alice"}, expires_in=60)
+        self.assertEqual(verify_token(token), (payload, False))
+        self.assertEqual(verify_token(token), (payload, True))
+
+        after_exp = payload["exp"] + settings.HTTPBIN_JWT_LEEWAY + 1
+        expired = TokenError("Token is expired")
+        with mock.patch("auth.tokens.time.time", return_value=after_exp), \
+                mock.patch("auth.tokens.decode_token", side_effect=expired) as decode:
+            with self.assertRaises(TokenError):
+                verify_token(token)
+        decode.assert_called_once_with(token)
+        self.assertEqual(len(get_verification_cache()), 0)
+
+    def test_validate_token_rejects_non_jwt_strings(self):
+        response = self.client.post("/auth/validate-token/", {"token": "opaque-token"}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["valid"])
+        self.assertEqual(response.json()["details"]["error"], "Token is malformed")
+
+    def test_validate_token_accepts_issued_jwt(self):
+        token, _ = issue_token({"sub": "alice"})
+        response = self.client.post("/auth/validate-token/", {"token": token}, content_type="application/json")
+        self.assertTrue(response.json()["valid"])
+        self.assertEqual(response.json()["details"]["claims"]["sub"], "alice")
+
+
+class LeanProfileTests(SimpleTestCase):
+    def test_jwt_endpoints_without_simplejwt_app(self):
+        # HTTPBIN_LEAN is read when settings load, so run JWTTests in a fresh interpreter.
+        result = subprocess.run(
+            [sys.executable, "manage.py", "test", "auth.tests.JWTTests"],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "server.settings", "HTTPBIN_LEAN": "1"},
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("\nOK", result.stderr)
+
+
+class TokenBatchTests(SimpleTestCase):
+    def setUp(self):
+        self.token, _ = issue_token({"sub": "alice"})
+
+    def test_json_array(self):
+        body = [self.token, "not-a-token", {"token": self.token}]
+        response = self.client.post(BATCH_URL, json.dumps(body), content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual([result["index"] for result in results], [0, 1, 2])
+        self.assertEqual([result["valid"] for result in results], [True, False, True])
+        self.assertEqual(results[0]["claims"]["sub"], "alice")
+        self.assertEqual(results[1]["error"], "Token is malformed")
+
+    def test_ndjson(self):
+        body = f"{json.dumps(self.token)}\n\n\"x.y.z\"\n"
+        response = self.client.post(BATCH_URL, body, content_type="application/x-ndjson")
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        results = [json.loads(line) for line in lines]
+        self.assertEqual([result["valid"] for result in results], [True, False])
+
+    @override_settings(HTTPBIN_TOKEN_BATCH_MAX_ITEMS=2)
+    def test_too_many_items(self):
+        body = json.dumps([self.token] * 3)
+        response = self.client.post(BATCH_URL, body, content_type="application/json")
+        self.assertEqual(response.status_code, 413)
+
+    @override_settings(HTTPBIN_TOKEN_BATCH_MAX_ITEMS=2)
+    def test_too_many_ndjson_items(self):
+        body = "\n".join([json.dumps(self.token)] * 3)
+        response = self.client.post(BATCH_URL, body, content_type="application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[-1]), {"error": "More than 2 tokens"})
+
+    @override_settings(HTTPBIN_TOKEN_BATCH_STREAM_THRESHOLD=1)
+    async def test_asgi_streams_asynchronously(self):
+        body = json.dumps([self.token, self.token])
+        response = await self.async_client.post(BATCH_URL, body, content_type="application/json")
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual([result["valid"] for result in json.loads(content)], [True, True])
+
+    async def test_slow_batch_does_not_block_other_requests(self):
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_check_token(token):
+            entered.set()
+            release.wait(5)
+            return '"valid":false,"error":"slow"'
+
+        body = json.dumps(self.token) + "\n"
+        with mock.patch("auth.tokens.check_token", slow_check_token):
+            response = await self.async_client.post(BATCH_URL, body, content_type="application/x-ndjson")
+
+            async def read_batch():
+                return b"".join([chunk async for chunk in response.streaming_content])
+
+            batch = asyncio.create_task(read_batch())
+            while not entered.is_set():
+                await asyncio.sleep(0.01)
+            other = await asyncio.wait_for(self.async_client.get("/http_methods/get/"), 2)
+            self.assertEqual(other.status_code, 200)
+            self.assertFalse(batch.done())
+            release.set()
+            self.assertEqual(json.loads(await batch)["error"], "slow")
+
+    async def test_asgi_ndjson_streams_asynchronously(self):
+        body = json.dumps(self.token) + "\n"
+        response = await self.async_client.post(BATCH_URL, body, content_type="application/x-ndjson")
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertTrue(json.loads(content)["valid"])
@@ -0,0 +1,181 @@
+"""
+JWT issuing and verification on top of ``rest_framework_simplejwt``.
+
+One ``TokenBackend`` per algorithm is built on first use and kept, so keys are
+read and prepared once. ``verify_token`` memoizes successful verifications
+in a bounded LRU until the token's ``exp``. Rejections are not cached: a
+token used before its ``nbf`` becomes valid later, and garbage tokens would
+only push real ones out.
+
+HS256 signs with ``HTTPBIN_JWT_SIGNING_KEY``. RS256 needs the
+``cryptography`` package and PEM files in ``HTTPBIN_JWT_RSA_PRIVATE_KEY`` and
+``HTTPBIN_JWT_RSA_PUBLIC_KEY``; without them it is reported as unavailable.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import jwt
+from django.conf import settings
+
+JWT_ALGORITHMS = ("HS256", "RS256")
+COMPACT = (",", ":")
+
+
+class TokenError(ValueError):
+    """A token could not be issued or verified; the message says why"""
+
+
+def _read_key(path):
+    if not path:
+        raise TokenError("RS256 keys are not configured")
+    return Path(path).read_text()
+
+
+@lru_cache(maxsize=None)
+def get_token_backend(algorithm):
+    """The cached ``TokenBackend`` for ``algorithm``; raises TokenError if unavailable"""
+    # Imported here: simplejwt pulls in django.contrib.auth models.
+    from rest_framework_simplejwt.backends import TokenBackend
+    from rest_framework_simplejwt.exceptions import TokenBackendError
+
+    if algorithm not in JWT_ALGORITHMS:
+        raise TokenError(f"Unsupported algorithm {algorithm!r}")
+    if algorithm == "HS256":
+        signing_key, verifying_key = settings.HTTPBIN_JWT_SIGNING_KEY, ""
+    else:
+        signing_key = _read_key(settings.HTTPBIN_JWT_RSA_PRIVATE_KEY)
+        verifying_key = _read_key(settings.HTTPBIN_JWT_RSA_PUBLIC_KEY)
+    try:
+        return TokenBackend(algorithm, signing_key, verifying_key, leeway=settings.HTTPBIN_JWT_LEEWAY)
+    except TokenBackendError as exc:
+        raise TokenError(str(exc)) from exc
+
+
+def issue_token(claims, algorithm="HS256", expires_in=None):
+    """
+    Sign ``claims`` with ``iat`` and ``exp`` set from ``expires_in`` seconds
+    (``HTTPBIN_JWT_LIFETIME`` by default). Returns (token, payload).
+    """
+    now = int(time.time())
+    lifetime = settings.HTTPBIN_JWT_LIFETIME if expires_in is None else expires_in
+    payload = {**claims, "iat": now, "exp": now + lifetime}
+    return get_token_backend(algorithm).encode(payload), payload
+
+
+def decode_token(token):
+    """Verify ``token`` without the cache; returns its claims or raises TokenError"""
+    from rest_framework_simplejwt.exceptions import TokenBackendError
+
+    try:
+        algorithm = jwt.get_unverified_header(token).get("alg")
+    except jwt.InvalidTokenError as exc:
+        raise TokenError("Token is malformed") from exc
+    if not isinstance(algorithm, str):
+        raise TokenError("Token is malformed")
+    backend = get_token_backend(algorithm)
+    try:
+        return backend.decode(token)
+    except TokenBackendError as exc:
+        raise TokenError(str(exc)) from exc
+
+
+class VerificationCache:
+    """
+    Bounded LRU of verified claims keyed by the token string. A hit past the
+    entry's ``valid_until`` is dropped and the token verified again.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, token, now):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            claims, valid_until = entry
+            if now >= valid_until:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def put(self, token, claims, valid_until):
+        with self._lock:
+            self._entries[token] = (claims, valid_until)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+
+
+def get_verification_cache():
+    global _cache
+    if _cache is None:
+        _cache = VerificationCache(settings.HTTPBIN_JWT_VERIFY_CACHE_SIZE)
+    return _cache
+
+
+def verify_token(token):
+    """
+    Verify ``token``, memoized until ``exp``. Returns (claims, cached); raises
+    TokenError if the token is rejected.
+    """
+    cache = get_verification_cache()
+    claims = cache.get(token, time.time())
+    if claims is not None:
+        return claims, True
+    claims = decode_token(token)
+    # Tokens without exp never expire; they are still bounded by the LRU.
+    exp = claims.get("exp")
+    valid_until = exp + settings.HTTPBIN_JWT_LEEWAY if isinstance(exp, (int, float)) else float("inf")
+    cache.put(token, claims, valid_until)
+    return claims, False
+
+
+def check_token(token):
+    """
+    Batch-mode validator: the JSON-encoded result fields for one token,
+    without the serializer round trip of /auth/validate-token/.
+    """
+    if not isinstance(token, str) or not token:
+        return '"valid":false,"error":"Expected a token string"'
+    if token.count(".") != 2:
+        return '"valid":false,"error":"Token is malformed"'
+    try:
+        claims, _ = verify_token(token)
+    except TokenError as exc:
+        return '"valid":false,"error":' + json.dumps(str(exc), separators=COMPACT)
+    return '"valid":true,"claims":' + json.dumps(claims, separators=COMPACT)
+
+
+def check_tokens(items):
+    """
+    Yield one encoded JSON result per item (a token string or {"token": ...}).
+    Each distinct token in the batch is verified and encoded once.
+    """
+    results = {}
+    for index, item in enumerate(items):
+        token = item.get("token") if isinstance(item, dict) else item
+        if not isinstance(token, str):
+            token = None
+        fields = results.get(token)
+        if fields is None:
+            fields = results[token] = check_token(token)
+        yield f'{{"index":{index},{fields}}}'
@@ -22,4 +22,11 @@ urlpatterns = [
         name="digest-auth",
     ),
     path("validate-token/", views.TokenValidationView.as_view(), name="validate-token"),
+    path(
+        "validate-token/batch/",
+        views.validate_token_batch_view,
+        name="validate-token-batch",
+    ),
+    path("jwt/issue/", views.JWTIssueView.as_view(), name="jwt-issue"),
+    path("jwt/verify/", views.JWTVerifyView.as_view(), name="jwt-verify"),
 ]
@@ -1,68 +1,199 @@
+import base64
+import binascii
 import hashlib
+import hmac
+import re
 import secrets
+import zlib
+from functools import lru_cache
+from urllib.parse import unquote
 
+from .nonces import get_nonce_store
 
-def generate_digest_challenge(realm="HTTPBin", qop="auth", algo="MD5"):
-    """Generate digest authentication challenge"""
-    nonce = secrets.token_hex(16)
+
+class CRC32:
+    """zlib.crc32 behind the hashlib update()/hexdigest() interface"""
+
+    name = "crc32"
+
+    def __init__(self, data=b""):
+        self.value = zlib.crc32(data)
+
+    def update(self, data):
+        self.value = zlib.crc32(data, self.value)
+
+    def digest(self):
+        return self.value.to_bytes(4, "big")
+
+    def hexdigest(self):
+        return f"{self.value:08x}"
+
+
+# Hash constructors by name, shared by digest auth and the body hashing
+# endpoint.
+HASH_ALGORITHMS = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "blake2b": hashlib.blake2b,
+    "crc32": CRC32,
+}
+
+
+def _sha512_256(data=b""):
+    return hashlib.new("sha512_256", data)
+
+
+# RFC 7616 algorithm tokens (each also has a "-sess" variant). SHA-512 is not
+# in the RFC but httpbin.org accepts it.
+DIGEST_ALGORITHMS = {
+    "MD5": HASH_ALGORITHMS["md5"],
+    "SHA-256": HASH_ALGORITHMS["sha256"],
+    "SHA-512-256": _sha512_256,
+    "SHA-512": hashlib.sha512,
+}
+HA1_CACHE_SIZE = 1024
+BASIC_CREDENTIALS_CACHE_SIZE = 1024
+
+# One auth-param: token "=" ( token / quoted-string ), then a comma or the end
+# of the header. Empty list elements are skipped (RFC 7235 section 2.1). The
+# outer group is the whole match, so findall() output shows whether the
+# params covered the header without gaps.
+DIGEST_PARAM = re.compile(
+    r'([\s,]*([!#$%&\'*+.^_`|~0-9A-Za-z-]+)\s*=\s*'
+    r'(?:"([^"\\]*(?:\\.[^"\\]*)*)"|([^\s",]*))\s*(?:,|\Z)[\s,]*)',
+    re.S,
+)
+QUOTED_PAIR = re.compile(r"\\(.)", re.S)
+
+
+def new_hasher(name):
+    """A fresh hasher for ``name``; raises KeyError if it is not supported"""
+    return HASH_ALGORITHMS[name.lower()]()
+
+
+@lru_cache(maxsize=BASIC_CREDENTIALS_CACHE_SIZE)
+def decode_basic_credentials(encoded):
+    """
+    (username, password) from the base64 part of a Basic Authorization header.
+    Cached, as clients resend the same header on every request. Raises
+    ValueError if it does not decode.
+    """
+    try:
+        credentials = base64.b64decode(encoded).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError(str(exc)) from exc
+    username, password = credentials.split(":", 1)
+    return username, password
+
+
+def credentials_match(username, password, expected_username, expected_password):
+    """Constant-time check of both fields; neither comparison short-circuits"""
+    username_ok = hmac.compare_digest(username.encode(), expected_username.encode())
+    password_ok = hmac.compare_digest(password.encode(), expected_password.encode())
+    return username_ok & password_ok
+
+
+def generate_digest_challenge(realm="HTTPBin", qop="auth", algo="MD5", stale=False):
+    """
+    Generate digest authentication challenge. The nonce is recorded in the
+    nonce store so later responses can be checked against it.
+    """
+    nonce = get_nonce_store().issue()
     opaque = secrets.token_hex(16)
 
     challenge = (
         f'realm="{realm}", qop="{qop}", nonce="{nonce}", '
         f'opaque="{opaque}", algorithm="{algo}"'
     )
+    if stale:
+        challenge += ", stale=true"
     return challenge, nonce, opaque
 
 
-def validate_digest_response(username, password, method, uri, auth_dict):
-    """Validate digest authentication response"""
+def parse_nonce_count(nc):
+    """The integer value of an 8-hex-digit ``nc``, or None if malformed"""
+    try:
+        return int(nc, 16)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_stale_after(stale_after):
+    """Uses allowed per nonce for the digest-auth route; None means never stale"""
+    try:
+        return int(stale_after)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_digest_header(params):
+    """
+    Parse the parameters of a ``Digest`` Authorization header in one pass.
+
+    Names are lower-cased, quoted values unescaped and an RFC 5987
+    ``username*`` decoded into ``username``. Returns None if the header is
+    malformed.
+    """
+    params = params.strip()
+    matches = DIGEST_PARAM.findall(params)
+    if sum(len(match[0]) for match in matches) != len(params):
+        return None
+
+    auth_dict = {}
+    for _, name, quoted, token in matches:
+        if "\\" in quoted:
+            quoted = QUOTED_PAIR.sub(r"\1", quoted)
+        auth_dict[name.lower()] = quoted or token
+
+    if "username*" in auth_dict and "username" not in auth_dict:
+        charset, _, encoded = auth_dict["username*"].partition("'")
+        _, _, encoded = encoded.partition("'")
+        try:
+            auth_dict["username"] = unquote(encoded, encoding=charset or "utf-8", errors="strict")
+        except (LookupError, UnicodeDecodeError):
+            return None
+    return auth_dict
+
+
+@lru_cache(maxsize=HA1_CACHE_SIZE)
+def digest_ha1(algorithm, username, realm, password):
+    """H(username:realm:password), cached since it only depends on credentials"""
+    return DIGEST_ALGORITHMS[algorithm](f"{username}:{realm}:{password}".encode()).hexdigest()
+
+
+def validate_digest_response(username, password, method, uri, auth_dict, challenged_algorithm):
+    """
+    Validate digest authentication response. The client's ``algorithm`` must
+    be the one it was challenged with, so a weaker one (e.g. MD5 for a
+    SHA-256 challenge) is rejected.
+    """
     realm = auth_dict.get("realm", "HTTPBin")
     nonce = auth_dict.get("nonce")
     response = auth_dict.get("response")
     qop = auth_dict.get("qop")
     nc = auth_dict.get("nc")
     cnonce = auth_dict.get("cnonce")
-    algorithm = auth_dict.get("algorithm", "MD5")
+    algorithm = auth_dict.get("algorithm", "MD5").upper()
 
-    if not all([nonce, response]):
+    if not all([nonce, response]) or algorithm != challenged_algorithm.upper():
         return False
 
-    # Calculate expected response based on algorithm
-    if algorithm.upper() == "MD5":
-        ha1 = hashlib.md5(
-            f"{username}:{realm}:{password}".encode()
-        ).hexdigest()
-        ha2 = hashlib.md5(f"{method}:{uri}".encode()).hexdigest()
-    elif algorithm.upper() == "SHA-256":
-        ha1 = hashlib.sha256(
-            f"{username}:{realm}:{password}".encode()
-        ).hexdigest()
-        ha2 = hashlib.sha256(f"{method}:{uri}".encode()).hexdigest()
-    else:
-        # Default to MD5 for unsupported algorithms
-        ha1 = hashlib.md5(
-            f"{username}:{realm}:{password}".encode()
-        ).hexdigest()
-        ha2 = hashlib.md5(f"{method}:{uri}".encode()).hexdigest()
+    # HA1, HA2 and the response all use the negotiated algorithm.
+    base, sess, rest = algorithm.partition("-SESS")
+    hash_func = DIGEST_ALGORITHMS.get(base)
+    if hash_func is None or rest:
+        return False
+    ha1 = digest_ha1(base, username, realm, password)
+    if sess:
+        ha1 = hash_func(f"{ha1}:{nonce}:{cnonce}".encode()).hexdigest()
+    ha2 = hash_func(f"{method}:{uri}".encode()).hexdigest()
 
     if qop:
-        expected = hashlib.md5(
+        expected = hash_func(
             f"{ha1}:{nonce}:{nc}:{cnonce}:{qop}:{ha2}".encode()
         ).hexdigest()
     else:
-        expected = hashlib.md5(f"{ha1}:{nonce}:{ha2}".encode()).hexdigest()
-
-    return response == expected
-
-
-def extract_request_headers(request):
-    """Extract all headers from request"""
-    headers = {}
-    for key, value in request.META.items():
-        if key.startswith("HTTP_"):
-            header_name = key[5:].replace("_", "-").title()
-            headers[header_name] = value
-        elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-            header_name = key.replace("_", "-").title()
-            headers[header_name] = value
-    return headers
+        expected = hash_func(f"{ha1}:{nonce}:{ha2}".encode()).hexdigest()
+
+    return hmac.compare_digest(response.lower().encode(), expected.encode())
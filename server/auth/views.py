@@ -1,6 +1,11 @@
-from django.http import HttpResponse
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -11,14 +16,23 @@ from .authentication import (
     HTTPBinDigestAuthentication,
 )
 from .serializers import (
+    JWTIssueSerializer,
+    JWTVerifySerializer,
     TokenValidationSerializer,
     TokenValidationResponseSerializer,
 )
+from .tokens import COMPACT, TokenError, check_tokens, issue_token, verify_token
+from .nonces import NONCE_STALE, NONCE_VALID, get_nonce_store
 from .utils import (
+    credentials_match,
     generate_digest_challenge,
+    parse_nonce_count,
+    parse_stale_after,
     validate_digest_response,
-    extract_request_headers,
 )
+from core.bodies import iter_lines
+from core.echo import extract_headers, get_origin
+from core.streaming import streaming_response
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -31,16 +45,15 @@ class BasicAuthView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, username, password):
-        auth_result = HTTPBinBasicAuthentication().authenticate(request)
-
-        if not auth_result:
+        # DRF already ran the authentication class; reuse its result.
+        if request.successful_authenticator is None:
             response = HttpResponse("Unauthorized", status=status.HTTP_401_UNAUTHORIZED)
             response["WWW-Authenticate"] = 'Basic realm="HTTPBin"'
             return response
 
-        auth_username, auth_password = auth_result[0]
+        auth_username, auth_password = request.user
 
-        if auth_username != username or auth_password != password:
+        if not credentials_match(auth_username, auth_password, username, password):
             response = HttpResponse("Unauthorized", status=status.HTTP_401_UNAUTHORIZED)
             response["WWW-Authenticate"] = 'Basic realm="HTTPBin"'
             return response
@@ -50,9 +63,9 @@ class BasicAuthView(APIView):
             "authenticated": True,
             "user": username,
             "method": "basic",
-            "headers": extract_request_headers(request),
+            "headers": extract_headers(request),
             "url": request.build_absolute_uri(),
-            "origin": request.META.get('REMOTE_ADDR', ''),
+            "origin": get_origin(request),
             "args": {"username": username, "password": password}
         }
 
@@ -69,14 +82,13 @@ class BearerAuthView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        auth_result = HTTPBinBearerAuthentication().authenticate(request)
-
-        if not auth_result:
+        # DRF already ran the authentication class; reuse its result.
+        if request.successful_authenticator is None:
             return Response(
                 {"error": "Bearer token required"}, status=status.HTTP_401_UNAUTHORIZED
             )
 
-        user, token = auth_result[0]
+        user, token = request.user
 
         # Return httpbin.org style response
         response_data = {
@@ -84,9 +96,9 @@ class BearerAuthView(APIView):
             "user": user,
             "token": token,
             "method": "bearer",
-            "headers": extract_request_headers(request),
+            "headers": extract_headers(request),
             "url": request.build_absolute_uri(),
-            "origin": request.META.get('REMOTE_ADDR', ''),
+            "origin": get_origin(request),
             "args": {}
         }
 
@@ -103,14 +115,13 @@ class HiddenBasicAuthView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, username, password):
-        auth_result = HTTPBinBasicAuthentication().authenticate(request)
-
-        if not auth_result:
+        # DRF already ran the authentication class; reuse its result.
+        if request.successful_authenticator is None:
             return Response({"error": "Not Found"}, status=status.HTTP_404_NOT_FOUND)
 
-        auth_username, auth_password = auth_result[0]
+        auth_username, auth_password = request.user
 
-        if auth_username != username or auth_password != password:
+        if not credentials_match(auth_username, auth_password, username, password):
             return Response({"error": "Not Found"}, status=status.HTTP_404_NOT_FOUND)
 
         # Return httpbin.org style response
@@ -118,9 +129,9 @@ class HiddenBasicAuthView(APIView):
             "authenticated": True,
             "user": username,
             "method": "hidden-basic",
-            "headers": extract_request_headers(request),
+            "headers": extract_headers(request),
             "url": request.build_absolute_uri(),
-            "origin": request.META.get('REMOTE_ADDR', ''),
+            "origin": get_origin(request),
             "args": {"username": username, "password": password}
         }
 
@@ -137,38 +148,38 @@ class DigestAuthView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, qop, username, password, algo, stale_after):
-        auth_result = HTTPBinDigestAuthentication().authenticate(request)
+        # DRF already ran HTTPBinDigestAuthentication; reuse its parse.
+        if request.successful_authenticator is None:
+            return self._challenge(qop, algo)
 
-        if not auth_result:
-            challenge, nonce, opaque = generate_digest_challenge(
-                qop=qop, algo=algo
-            )
-            response = HttpResponse("Unauthorized", status=status.HTTP_401_UNAUTHORIZED)
-            response["WWW-Authenticate"] = f"Digest {challenge}"
-            return response
-
-        auth_username, auth_dict = auth_result[0]
+        auth_username, auth_dict = request.user
 
         # Validate digest response
         if not validate_digest_response(
             username, password, request.method, 
-            request.get_full_path(), auth_dict
+            request.get_full_path(), auth_dict, algo
         ):
-            challenge, nonce, opaque = generate_digest_challenge(
-                qop=qop, algo=algo
-            )
-            response = HttpResponse("Unauthorized", status=status.HTTP_401_UNAUTHORIZED)
-            response["WWW-Authenticate"] = f"Digest {challenge}"
-            return response
+            return self._challenge(qop, algo)
+
+        # The response is correct for its nonce; now check the nonce itself.
+        # nc must increase on every request made with the same nonce.
+        nc = None
+        if auth_dict.get("qop"):
+            nc = parse_nonce_count(auth_dict.get("nc"))
+            if nc is None:
+                return self._challenge(qop, algo)
+        verdict = get_nonce_store().use(auth_dict["nonce"], nc, parse_stale_after(stale_after))
+        if verdict != NONCE_VALID:
+            return self._challenge(qop, algo, stale=verdict == NONCE_STALE)
 
         # Return httpbin.org style response
         response_data = {
             "authenticated": True,
             "user": username,
             "method": "digest",
-            "headers": extract_request_headers(request),
+            "headers": extract_headers(request),
             "url": request.build_absolute_uri(),
-            "origin": request.META.get('REMOTE_ADDR', ''),
+            "origin": get_origin(request),
             "args": {
                 "qop": qop, 
                 "username": username, 
@@ -180,6 +191,14 @@ class DigestAuthView(APIView):
 
         return Response(response_data)
 
+    def _challenge(self, qop, algo, stale=False):
+        challenge, nonce, opaque = generate_digest_challenge(
+            qop=qop, algo=algo, stale=stale
+        )
+        response = HttpResponse("Unauthorized", status=status.HTTP_401_UNAUTHORIZED)
+        response["WWW-Authenticate"] = f"Digest {challenge}"
+        return response
+
 
 @method_decorator(csrf_exempt, name="dispatch")
 class TokenValidationView(APIView):
@@ -220,16 +239,21 @@ class TokenValidationView(APIView):
         # Use header token if available, otherwise use body token
         final_token = header_token if header_token else token
 
-        # Simple validation - in real app, you'd validate against your token system
-        is_valid = len(final_token) > 10  # Simple length check
-
         details = {
             "length": len(final_token),
             "source": "header" if header_token else "body",
             "auth_method": auth_method,
-            "headers": extract_request_headers(request),
+            "headers": extract_headers(request),
         }
 
+        # Tokens are checked as JWTs issued by /auth/jwt/issue/
+        try:
+            details["claims"], _ = verify_token(final_token)
+            is_valid = True
+        except TokenError as exc:
+            details["error"] = str(exc)
+            is_valid = False
+
         response_data = {
             "valid": is_valid,
             "token": final_token[:20] + "..." if len(final_token) > 20 else final_token,
@@ -239,3 +263,143 @@ class TokenValidationView(APIView):
 
         response_serializer = TokenValidationResponseSerializer(response_data)
         return Response(response_serializer.data)
+
+
+# Results are sent in chunks of this many items when streaming.
+BATCH_CHUNK_ITEMS = 256
+
+
+def _ndjson_items(request, max_items):
+    """Parsed items of an NDJSON body, read line by line; blank lines are skipped"""
+    count = 0
+    for line in iter_lines(request):
+        if not line.strip():
+            continue
+        count += 1
+        if count > max_items:
+            raise OverflowError
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _ndjson_results(request, max_items):
+    chunk = []
+    try:
+        for result in check_tokens(_ndjson_items(request, max_items)):
+            chunk.append(result)
+            if len(chunk) == BATCH_CHUNK_ITEMS:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+    except OverflowError:
+        chunk.append(json.dumps({"error": f"More than {max_items} tokens"}, separators=COMPACT))
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def _json_array_results(items):
+    results = check_tokens(items)
+    yield "["
+    separator = ""
+    while chunk := list(islice(results, BATCH_CHUNK_ITEMS)):
+        yield separator + ",".join(chunk)
+        separator = ","
+    yield "]"
+
+
+@csrf_exempt
+@require_POST
+def validate_token_batch_view(request):
+    """
+    Validate many JWTs in one request. The body is a JSON array of tokens, or
+    NDJSON (one token per line) with ``Content-Type: application/x-ndjson``;
+    items may also be ``{"token": ...}`` objects. Results come back in the
+    same format, one ``{"index", "valid", "claims" | "error"}`` per item.
+
+    NDJSON is read and answered line by line. JSON arrays with more than
+    ``HTTPBIN_TOKEN_BATCH_STREAM_THRESHOLD`` items are streamed.
+    """
+    max_items = settings.HTTPBIN_TOKEN_BATCH_MAX_ITEMS
+    if request.content_type in ("application/x-ndjson", "application/jsonl"):
+        return streaming_response(request, _ndjson_results(request, max_items), "application/x-ndjson")
+
+    try:
+        items = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Body must be a JSON array or NDJSON"}, status=400)
+    if not isinstance(items, list):
+        return JsonResponse({"error": "Body must be a JSON array or NDJSON"}, status=400)
+    if len(items) > max_items:
+        return JsonResponse({"error": f"More than {max_items} tokens"}, status=413)
+
+    if len(items) > settings.HTTPBIN_TOKEN_BATCH_STREAM_THRESHOLD:
+        return streaming_response(request, _json_array_results(items), "application/json")
+    return HttpResponse("".join(_json_array_results(items)), content_type="application/json")
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class JWTIssueView(APIView):
+    """
+    Issue a signed JWT
+    POST /auth/jwt/issue  {"claims": {...}, "algorithm": "HS256", "expires_in": 300}
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = JWTIssueSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        try:
+            token, payload = issue_token(data["claims"], data["algorithm"], data.get("expires_in"))
+        except TokenError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "token": token,
+                "algorithm": data["algorithm"],
+                "claims": payload,
+                "expires_at": payload["exp"],
+            }
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class JWTVerifyView(APIView):
+    """
+    Verify a JWT from the Authorization: Bearer header or the body's "token"
+    GET/POST /auth/jwt/verify
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return self._verify(request, None)
+
+    def post(self, request):
+        return self._verify(request, request.data)
+
+    def _verify(self, request, data):
+        auth_header = request.META.get("HTTP_AUTHORIZATION", "")
+        if auth_header.startswith("Bearer "):
+            token = auth_header[7:]
+        else:
+            serializer = JWTVerifySerializer(data=data or {})
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            token = serializer.validated_data["token"]
+
+        try:
+            claims, cached = verify_token(token)
+        except TokenError as exc:
+            response = Response(
+                {"valid": False, "error": str(exc)}, status=status.HTTP_401_UNAUTHORIZED
+            )
+            response["WWW-Authenticate"] = 'Bearer error="invalid_token"'
+            return response
+
+        return Response({"valid": True, "claims": claims, "cached": cached})
@@ -0,0 +1,99 @@
+"""
+Helpers for the bulk and signed cookie endpoints.
+
+``PresetMorsel`` carries a ready-made ``Set-Cookie`` value, so setting or
+deleting hundreds of generated cookies skips ``set_cookie``'s per-cookie
+attribute handling and quoting. ``CookieSigner`` is installed as
+``SIGNING_BACKEND``: it signs exactly like ``TimestampSigner``, so
+``set_signed_cookie``/``get_signed_cookie`` are unchanged, but derives each
+salt's HMAC key once instead of on every call.
+"""
+
+import re
+import string
+from functools import lru_cache
+from http.cookies import Morsel
+from itertools import cycle, islice
+
+from django.core import signing
+from django.core.signing import TimestampSigner, b64_encode
+from django.http.cookie import parse_cookie
+from django.utils.crypto import salted_hmac
+from django.utils.encoding import force_bytes
+
+COOKIE_PARSE_CACHE_SIZE = 64
+SIGNING_KEY_CACHE_SIZE = 1024
+
+# RFC 6265 cookie-name (an RFC 7230 token)
+COOKIE_NAME = re.compile(r"[!#$%&'*+\-.^_`|~0-9A-Za-z]+")
+VALUE_ALPHABET = string.ascii_letters + string.digits
+
+DELETE_ATTRIBUTES = "; expires=Thu, 01 Jan 1970 00:00:00 GMT; Max-Age=0; Path=/"
+SET_ATTRIBUTES = "; Path=/"
+
+
+class PresetMorsel(Morsel):
+    """
+    A cookie whose ``Set-Cookie`` value is fixed up front. ``value`` must
+    already be a valid cookie-value; changing attributes afterwards has no
+    effect on the output.
+    """
+
+    def __init__(self, key, value, attributes):
+        super().__init__()
+        self._key = key
+        self._value = self._coded_value = value
+        self._attributes = attributes
+
+    def output(self, attrs=None, header="Set-Cookie:"):
+        return f"{header} {self._key}={self._coded_value}{self._attributes}"
+
+
+def add_preset_cookies(response, names, value, attributes):
+    """Add one ``PresetMorsel`` per name to ``response.cookies``"""
+    cookies = response.cookies
+    for name in names:
+        # dict.__setitem__: SimpleCookie's own would wrap the value in a Morsel.
+        dict.__setitem__(cookies, name, PresetMorsel(name, value, attributes))
+
+
+@lru_cache(maxsize=16)
+def cookie_value(size):
+    """A ``size``-character cookie-value that needs no quoting"""
+    return "".join(islice(cycle(VALUE_ALPHABET), size))
+
+
+@lru_cache(maxsize=COOKIE_PARSE_CACHE_SIZE)
+def parse_cookie_header(header):
+    """
+    ``parse_cookie`` memoized per header: a client replaying the same large
+    jar is parsed once. The returned dict is shared and must not be mutated.
+    """
+    return parse_cookie(header)
+
+
+@lru_cache(maxsize=SIGNING_KEY_CACHE_SIZE)
+def _keyed_hmac(salt, key, algorithm):
+    # salted_hmac over an empty message is the keyed HMAC before any input;
+    # copies of it skip both the key derivation and the key setup.
+    return salted_hmac(salt, b"", key, algorithm=algorithm)
+
+
+class CookieSigner(TimestampSigner):
+    """``TimestampSigner`` with the derived HMAC key cached per salt and key"""
+
+    def signature(self, value, key=None):
+        mac = _keyed_hmac(self.salt + "signer", key or self.key, self.algorithm).copy()
+        mac.update(force_bytes(value))
+        return b64_encode(mac.digest()).decode()
+
+
+def unsign_cookie(name, value, salt="", max_age=None):
+    """
+    ``request.get_signed_cookie(name, salt=salt, max_age=max_age)`` for a
+    value from an already parsed Cookie header; raises ``BadSignature``.
+
+    Goes through the same signing helper, so the per-cookie salt and the
+    legacy salt fallback stay Django's, and the signer is ``CookieSigner``.
+    """
+    return signing._unsign_cookie(value, cookie_name=name, salt=salt, max_age=max_age)
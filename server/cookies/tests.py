@@ -1,3 +1,108 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .jar import DELETE_ATTRIBUTES, SET_ATTRIBUTES, PresetMorsel, add_preset_cookies
+
+
+class SignedCookieTests(SimpleTestCase):
+    def test_signed_set_is_accepted_by_get_signed_cookie(self):
+        response = self.client.get("/cookies/signed/set/?a=1&b=two&salt=pepper")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["set"]["a"], response.cookies["a"].value)
+
+        cookie = "; ".join(f"{name}={response.cookies[name].value}" for name in ("a", "b"))
+        request = RequestFactory().get("/", HTTP_COOKIE=cookie)
+        self.assertEqual(request.get_signed_cookie("a", salt="pepper"), "1")
+        self.assertEqual(request.get_signed_cookie("b", salt="pepper"), "two")
+        self.assertIsNone(request.get_signed_cookie("a", default=None, salt="other"))
+
+    def test_set_signed_cookie_is_accepted_by_signed_view(self):
+        response = HttpResponse()
+        response.set_signed_cookie("a", "1", salt="pepper")
+        self.client.cookies["a"] = response.cookies["a"].value
+        self.client.cookies["forged"] = "value:abc:def"
+
+        result = self.client.get("/cookies/signed/?salt=pepper").json()
+        self.assertEqual(result["valid"], {"a": "1"})
+        self.assertEqual(list(result["invalid"]), ["forged"])
+
+    def test_wrong_salt_is_invalid(self):
+        self.client.get("/cookies/signed/set/?a=1&salt=pepper")
+        result = self.client.get("/cookies/signed/?salt=salt").json()
+        self.assertEqual(result["valid"], {})
+        self.assertIn("a", result["invalid"])
+
+    def test_max_age_expiry(self):
+        self.client.get("/cookies/signed/set/?a=1")
+        self.assertEqual(self.client.get("/cookies/signed/?max_age=60").json()["valid"], {"a": "1"})
+        with mock.patch("django.core.signing.time.time", return_value=time.time() + 120):
+            result = self.client.get("/cookies/signed/?max_age=60").json()
+        self.assertEqual(result["valid"], {})
+        self.assertIn("a", result["invalid"])
+
+    def test_bad_max_age(self):
+        self.assertEqual(self.client.get("/cookies/signed/?max_age=soon").status_code, 400)
+
+    def test_view_verifies_the_parsed_header(self):
+        self.client.get("/cookies/signed/set/?a=1&salt=pepper")
+        with mock.patch.object(HttpRequest, "get_signed_cookie", side_effect=AssertionError):
+            result = self.client.get("/cookies/signed/?salt=pepper").json()
+        self.assertEqual(result, {"valid": {"a": "1"}, "invalid": {}})
+
+
+@override_settings(HTTPBIN_COOKIE_BULK_MAX_COUNT=5, HTTPBIN_COOKIE_BULK_MAX_SIZE=8)
+class BulkCookieTests(SimpleTestCase):
+    def test_bulk_set(self):
+        response = self.client.get("/cookies/bulk/set/?count=3&size=4&prefix=x")
+        self.assertEqual(response.json(), {"set": 3, "prefix": "x", "size": 4})
+        self.assertEqual(sorted(response.cookies), ["x0", "x1", "x2"])
+        self.assertEqual(response.cookies["x1"].value, "abcd")
+
+    def test_bulk_set_limits(self):
+        for query in ("count=6", "size=9", "count=-1", "count=many", "prefix=a;b", "prefix="):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/cookies/bulk/set/?{query}").status_code, 400)
+
+    def test_bulk_set_at_limits(self):
+        response = self.client.get("/cookies/bulk/set/?count=5&size=8")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.cookies), 5)
+
+    def test_bulk_delete_by_count(self):
+        response = self.client.get("/cookies/bulk/delete/?count=2&prefix=x")
+        self.assertEqual(response.json(), {"deleted": 2, "prefix": "x"})
+        self.assertEqual(sorted(response.cookies), ["x0", "x1"])
+        self.assertIn("Max-Age=0", response.cookies["x0"].output())
+
+    def test_bulk_delete_by_prefix(self):
+        self.client.cookies["x0"] = "1"
+        self.client.cookies["x9"] = "1"
+        self.client.cookies["other"] = "1"
+        response = self.client.get("/cookies/bulk/delete/?prefix=x")
+        self.assertEqual(response.json()["deleted"], 2)
+        self.assertEqual(sorted(response.cookies), ["x0", "x9"])
+
+    def test_bulk_delete_limits(self):
+        for query in ("count=6", "count=-1", "prefix=a%20b"):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/cookies/bulk/delete/?{query}").status_code, 400)
+
+
+class PresetMorselTests(SimpleTestCase):
+    def test_output(self):
+        morsel = PresetMorsel("name", "value", SET_ATTRIBUTES)
+        self.assertEqual(morsel.output(), "Set-Cookie: name=value; Path=/")
+        self.assertEqual(morsel.output(header=""), " name=value; Path=/")
+        morsel["max-age"] = 10
+        self.assertEqual(morsel.output(), "Set-Cookie: name=value; Path=/")
+
+    def test_response_headers(self):
+        response = HttpResponse()
+        add_preset_cookies(response, ["a", "b"], '""', DELETE_ATTRIBUTES)
+        self.assertEqual(
+            response.cookies.output(),
+            f'Set-Cookie: a=""{DELETE_ATTRIBUTES}\r\nSet-Cookie: b=""{DELETE_ATTRIBUTES}',
+        )
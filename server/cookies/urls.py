@@ -7,4 +7,8 @@ urlpatterns = [
     path("", views.CookiesView.as_view(), name="cookies"),
     path("set/", views.SetCookiesView.as_view(), name="cookies-set"),
     path("delete/", views.DeleteCookiesView.as_view(), name="cookies-delete"),
+    path("bulk/set/", views.BulkSetCookiesView.as_view(), name="cookies-bulk-set"),
+    path("bulk/delete/", views.BulkDeleteCookiesView.as_view(), name="cookies-bulk-delete"),
+    path("signed/", views.VerifySignedCookiesView.as_view(), name="cookies-signed"),
+    path("signed/set/", views.SetSignedCookiesView.as_view(), name="cookies-signed-set"),
 ]
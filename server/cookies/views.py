@@ -1,14 +1,51 @@
+from django.conf import settings
+from django.core.signing import BadSignature
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from .jar import (
+    COOKIE_NAME,
+    DELETE_ATTRIBUTES,
+    SET_ATTRIBUTES,
+    add_preset_cookies,
+    cookie_value,
+    parse_cookie_header,
+    unsign_cookie,
+)
+
 
 def _cookies_dict(request):
-    return {k: v for k, v in request.COOKIES.items()}
+    return parse_cookie_header(request.META.get("HTTP_COOKIE", ""))
+
+
+def _int_param(request, name, default, maximum):
+    """A bounded integer query parameter; raises ValueError with a message"""
+    raw = request.GET.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if not 0 <= value <= maximum:
+        raise ValueError(f"{name} must be between 0 and {maximum}")
+    return value
+
+
+def _bad_request(message):
+    return Response({"error": message}, status=status.HTTP_400_BAD_REQUEST)
+
+
+BULK_PARAMETERS = [
+    openapi.Parameter("count", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+    openapi.Parameter("prefix", openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False),
+]
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -71,3 +108,109 @@ class DeleteCookiesView(APIView):
         for k in request.GET.keys():
             resp.delete_cookie(k)
         return resp
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class BulkSetCookiesView(APIView):
+    """Set ``count`` generated cookies named ``{prefix}{i}`` with ``size``-byte values"""
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        manual_parameters=BULK_PARAMETERS + [
+            openapi.Parameter("size", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+        ],
+        responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)},
+    )
+    def get(self, request):
+        prefix = request.GET.get("prefix", "bulk")
+        if not COOKIE_NAME.fullmatch(prefix):
+            return _bad_request("prefix must be a cookie-name token")
+        try:
+            count = _int_param(request, "count", 10, settings.HTTPBIN_COOKIE_BULK_MAX_COUNT)
+            size = _int_param(request, "size", 16, settings.HTTPBIN_COOKIE_BULK_MAX_SIZE)
+        except ValueError as exc:
+            return _bad_request(str(exc))
+
+        resp = Response({"set": count, "prefix": prefix, "size": size})
+        names = [f"{prefix}{i}" for i in range(count)]
+        add_preset_cookies(resp, names, cookie_value(size), SET_ATTRIBUTES)
+        return resp
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class BulkDeleteCookiesView(APIView):
+    """
+    Delete ``{prefix}0`` .. ``{prefix}{count-1}``, or without ``count`` every
+    request cookie starting with ``prefix``
+    """
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        manual_parameters=BULK_PARAMETERS,
+        responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)},
+    )
+    def get(self, request):
+        prefix = request.GET.get("prefix", "bulk")
+        if not COOKIE_NAME.fullmatch(prefix):
+            return _bad_request("prefix must be a cookie-name token")
+        try:
+            count = _int_param(request, "count", None, settings.HTTPBIN_COOKIE_BULK_MAX_COUNT)
+        except ValueError as exc:
+            return _bad_request(str(exc))
+
+        if count is None:
+            names = [name for name in _cookies_dict(request) if name.startswith(prefix) and COOKIE_NAME.fullmatch(name)]
+        else:
+            names = [f"{prefix}{i}" for i in range(count)]
+        resp = Response({"deleted": len(names), "prefix": prefix})
+        add_preset_cookies(resp, names, '""', DELETE_ATTRIBUTES)
+        return resp
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SetSignedCookiesView(APIView):
+    """Set every query parameter (except ``salt``) as a signed cookie"""
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter("salt", openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False),
+        ],
+        responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)},
+    )
+    def get(self, request):
+        salt = request.GET.get("salt", "")
+        values = {k: v for k, v in request.GET.items() if k != "salt"}
+        resp = Response()
+        for k, v in values.items():
+            resp.set_signed_cookie(k, v, salt=salt)
+        resp.data = {"set": {k: resp.cookies[k].value for k in values}}
+        return resp
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class VerifySignedCookiesView(APIView):
+    """Check the signature (and optional ``max_age``) of every request cookie"""
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter("salt", openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter("max_age", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+        ],
+        responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)},
+    )
+    def get(self, request):
+        salt = request.GET.get("salt", "")
+        try:
+            max_age = _int_param(request, "max_age", None, 2**31)
+        except ValueError as exc:
+            return _bad_request(str(exc))
+
+        valid, invalid = {}, {}
+        for name, value in _cookies_dict(request).items():
+            try:
+                valid[name] = unsign_cookie(name, value, salt=salt, max_age=max_age)
+            except BadSignature as exc:
+                invalid[name] = str(exc)
+        return Response({"valid": valid, "invalid": invalid})
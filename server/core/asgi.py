@@ -0,0 +1,61 @@
+"""
+ASGI wrappers applied in server.asgi.
+
+Django's ASGIHandler reads the whole request body into a spooled temporary
+file before any view runs, so a view cannot observe upload throughput.
+``BodySinkApplication`` answers the upload sink itself, straight from
+``receive()``, and hands every other request to Django.
+"""
+
+import json
+import time
+
+from .bodies import throughput
+
+SINK_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+class BodySinkApplication:
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in SINK_METHODS or self._path(scope) not in self.paths:
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        received = chunks = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body = message.get("body", b"")
+            if body:
+                received += len(body)
+                chunks += 1
+            if not message.get("more_body", False):
+                break
+        elapsed = time.perf_counter() - start
+
+        chunked = not any(name == b"content-length" for name, _ in scope["headers"])
+        payload = json.dumps(throughput(received, chunks, elapsed, chunked)).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+    @staticmethod
+    def _path(scope):
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        return path
@@ -0,0 +1,186 @@
+"""
+Helpers shared by the ``bench_*`` management commands.
+
+Requests are driven straight through Django's WSGI and ASGI handlers, so the
+numbers include the full middleware and view stack but no socket I/O.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+from django.conf import settings
+
+
+def wsgi_environ(path, method="GET", query_string="", headers=None, body=b""):
+    """Build a minimal WSGI environ for ``path``"""
+    environ = {
+        "REQUEST_METHOD": method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    if body:
+        environ["CONTENT_LENGTH"] = str(len(body))
+    for name, value in (headers or {}).items():
+        key = name.upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = f"HTTP_{key}"
+        environ[key] = value
+    return environ
+
+
+def call_wsgi(app, environ):
+    """Run one request through a WSGI app and return (status, body)"""
+    status_line = []
+
+    def start_response(status, response_headers, exc_info=None):
+        status_line.append(status)
+
+    result = app(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return int(status_line[0].split(" ", 1)[0]), body
+
+
+async def call_asgi(app, path, method="GET", query_string="", headers=None, body=b""):
+    """Run one request through an ASGI app and return (status, body)"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost")]
+        + [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in (headers or {}).items()
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+    disconnected = asyncio.Event()
+    status = []
+    chunks = []
+
+    async def receive():
+        if pending:
+            return pending.pop(0)
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return status[0], b"".join(chunks)
+
+
+def timed(func, *args, **kwargs):
+    """Call ``func`` and return (elapsed seconds, result)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def summarize(latencies, elapsed):
+    """Reduce per-request latencies (seconds) to the figures we report"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "elapsed": elapsed,
+        "rps": count / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(ordered) * 1000 if ordered else 0.0,
+        "p99_ms": ordered[min(count - 1, int(count * 0.99))] * 1000 if ordered else 0.0,
+    }
+
+
+def format_summary(label, summary):
+    return (
+        f"{label:<24} {summary['requests']:>7} req  {summary['elapsed']:8.3f} s  "
+        f"{summary['rps']:10.1f} req/s  p50 {summary['p50_ms']:8.3f} ms  "
+        f"p99 {summary['p99_ms']:8.3f} ms"
+    )
+
+
+def run_child(command, args=(), env=None):
+    """
+    Run ``manage.py <command> <args>`` in a fresh interpreter and return the
+    JSON it prints. Used to compare configurations that are fixed at import
+    time (URLconf, middleware, settings module).
+    """
+    manage = os.path.join(settings.BASE_DIR, "manage.py")
+    result = subprocess.run(
+        [sys.executable, manage, command, *args],
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_children(command, args=(), env=None, count=1):
+    """``run_child`` in ``count`` concurrent interpreters; returns their JSON outputs"""
+    manage = os.path.join(settings.BASE_DIR, "manage.py")
+    processes = [
+        subprocess.Popen(
+            [sys.executable, manage, command, *args],
+            env={**os.environ, **(env or {})},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(count)
+    ]
+    outputs = []
+    for process in processes:
+        stdout, stderr = process.communicate()
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, process.args, stdout, stderr)
+        outputs.append(json.loads(stdout.strip().splitlines()[-1]))
+    return outputs
+
+
+def measure_wsgi(app, environ_factory, number, warmup=100):
+    """Sequential latencies for ``number`` requests through a WSGI app"""
+    for _ in range(warmup):
+        call_wsgi(app, environ_factory())
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(number):
+        environ = environ_factory()
+        t0 = time.perf_counter()
+        call_wsgi(app, environ)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
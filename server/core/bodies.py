@@ -0,0 +1,202 @@
+"""
+Incremental request-body helpers.
+
+``iter_body`` reads the body straight from the WSGI input (or the ASGI
+request's spooled body) in fixed-size chunks, so a view can look at every
+byte without ever holding the whole body in memory. ``BodyDigest`` folds
+those chunks into a length, hex digests and a head/tail sample.
+"""
+
+import io
+import time
+
+from django.conf import settings
+
+from auth.utils import new_hasher
+
+BODY_CHUNK_SIZE = 64 * 1024
+SINK_CHUNK_SIZE = 1024 * 1024
+SAMPLE_SIZE = 256
+STREAM_ECHO_DIGESTS = ("md5", "sha256")
+
+
+def content_length(request):
+    """The request's Content-Length, or None if it is missing or invalid"""
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or "")
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def is_chunked(request):
+    """
+    True for a body without Content-Length that the WSGI server has already
+    de-chunked (``wsgi.input_terminated``). Django's own stream reads such a
+    body as empty, so ``iter_body`` reads the server's input directly.
+    """
+    return content_length(request) is None and bool(request.META.get("wsgi.input_terminated"))
+
+
+def iter_body(request, chunk_size=BODY_CHUNK_SIZE):
+    """Yield the raw request body in chunks of at most ``chunk_size`` bytes"""
+    read = request.META["wsgi.input"].read if is_chunked(request) else request.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_lines(request, chunk_size=BODY_CHUNK_SIZE):
+    """Yield the body's ``\n``-separated lines (without the separator) as they arrive"""
+    pending = b""
+    for chunk in iter_body(request, chunk_size):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+class BodyDigest:
+    """Length, digests and head/tail sample of a body fed chunk by chunk"""
+
+    def __init__(self, hashers, sample_size=SAMPLE_SIZE):
+        self.hashers = hashers
+        self.sample_size = sample_size
+        self.length = 0
+        self.head = bytearray()
+        self.tail = bytearray()
+
+    def update(self, chunk):
+        self.length += len(chunk)
+        for hasher in self.hashers.values():
+            hasher.update(chunk)
+        if len(self.head) < self.sample_size:
+            self.head += chunk[: self.sample_size - len(self.head)]
+        self.tail += chunk[-self.sample_size :]
+        del self.tail[: -self.sample_size]
+
+    def digests(self):
+        return {name: hasher.hexdigest() for name, hasher in self.hashers.items()}
+
+    def summary(self):
+        return {
+            "length": self.length,
+            **self.digests(),
+            "head": self.head.decode("utf-8", "replace"),
+            "tail": self.tail.decode("utf-8", "replace"),
+            "truncated": self.length > self.sample_size,
+        }
+
+
+class ReplayReader:
+    """File-like reader that returns ``head`` and then the rest of ``source``"""
+
+    def __init__(self, head, source):
+        self.head = head
+        self.offset = 0
+        self.source = source
+
+    def read(self, size=-1):
+        if self.offset >= len(self.head):
+            return self.source.read(size)
+        if size is None or size < 0:
+            data = self.head[self.offset :] + self.source.read()
+        else:
+            data = self.head[self.offset : self.offset + size]
+        self.offset += len(data)
+        return data
+
+    def close(self):
+        # ASGIRequest.close() calls this; the source belongs to the server.
+        pass
+
+
+def _buffer_unsized_body(request, limit):
+    """
+    Read a body without Content-Length up to ``limit`` + 1 bytes and return
+    how much was read. A body that ended within ``limit`` is put back with
+    its length set, so Django and DRF parse it like any other; otherwise the
+    bytes read are replayed ahead of the rest of the body.
+    """
+    chunked = is_chunked(request)
+    source = request.META["wsgi.input"] if chunked else request._stream
+    chunks = []
+    size = 0
+    while size <= limit:
+        chunk = source.read(min(BODY_CHUNK_SIZE, limit + 1 - size))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+    head = b"".join(chunks)
+
+    # As in RequestDecompressionMiddleware: there is no public hook for
+    # replacing the body stream.
+    if size <= limit:
+        request._stream = io.BytesIO(head)
+        request.META["CONTENT_LENGTH"] = str(size)
+    else:
+        request._stream = ReplayReader(head, source)
+        if chunked:
+            request.META["wsgi.input"] = request._stream
+    return size
+
+
+def should_stream_echo(request):
+    """
+    True if the body is too large to parse and echo back in full.
+
+    A chunked body (or an ASGI body without Content-Length) is read up to
+    the threshold to find out; see ``_buffer_unsized_body``.
+    """
+    threshold = settings.HTTPBIN_STREAM_ECHO_THRESHOLD
+    length = content_length(request)
+    if length is None and (is_chunked(request) or "wsgi.input" not in request.META):
+        length = _buffer_unsized_body(getattr(request, "_request", request), threshold)
+    return length is not None and length > threshold
+
+
+def streamed_body_fields(request):
+    """
+    ``core.echo.body_fields`` for a large body: nothing is parsed, and the
+    body is summarized under ``body`` instead of being copied into ``data``.
+    """
+    digest = BodyDigest({name: new_hasher(name) for name in STREAM_ECHO_DIGESTS})
+    for chunk in iter_body(request):
+        digest.update(chunk)
+    return {"data": "", "files": {}, "form": {}, "json": None, "body": digest.summary()}
+
+
+def digest_body(request, hashers, chunk_size=SINK_CHUNK_SIZE):
+    """Feed the whole body through every hasher in one pass; returns its length"""
+    updates = [hasher.update for hasher in hashers.values()]
+    length = 0
+    for chunk in iter_body(request, chunk_size):
+        length += len(chunk)
+        for update in updates:
+            update(chunk)
+    return length
+
+
+def throughput(received, chunks, elapsed, chunked):
+    """Statistics reported by the upload sink"""
+    return {
+        "bytes": received,
+        "chunks": chunks,
+        "elapsed": elapsed,
+        "mb_per_s": received / elapsed / 1e6 if elapsed else 0.0,
+        "chunked": chunked,
+    }
+
+
+def drain_body(request, chunk_size=SINK_CHUNK_SIZE):
+    """Read and discard the request body, returning ``throughput()`` stats"""
+    start = time.perf_counter()
+    received = chunks = 0
+    for chunk in iter_body(request, chunk_size):
+        received += len(chunk)
+        chunks += 1
+    return throughput(received, chunks, time.perf_counter() - start, content_length(request) is None)
@@ -0,0 +1,66 @@
+"""
+System checks for ``HTTPBIN_MIDDLEWARE_PROFILES``.
+
+The admin's own middleware checks (admin.E408-E410) only look at
+``MIDDLEWARE`` and are silenced in settings, because sessions, auth and
+messages run in the ``/admin/`` route profile instead. ``check_admin_profile``
+applies the same rules to that profile.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+from django.utils.module_loading import import_string
+
+ADMIN_PREFIX = "/admin/"
+
+SESSION_MIDDLEWARE = "django.contrib.sessions.middleware.SessionMiddleware"
+AUTH_MIDDLEWARE = "django.contrib.auth.middleware.AuthenticationMiddleware"
+MESSAGE_MIDDLEWARE = "django.contrib.messages.middleware.MessageMiddleware"
+
+
+def _index_of_subclass(class_path, candidate_paths):
+    """Position of ``class_path`` or a subclass in ``candidate_paths``, or None"""
+    cls = import_string(class_path)
+    for index, path in enumerate(candidate_paths):
+        try:
+            if issubclass(import_string(path), cls):
+                return index
+        except ImportError:
+            continue
+    return None
+
+
+@checks.register(checks.Tags.admin)
+def check_admin_profile(app_configs, **kwargs):
+    if not apps.is_installed("django.contrib.admin"):
+        return []
+    profiles = getattr(settings, "HTTPBIN_MIDDLEWARE_PROFILES", {})
+    # Middleware in MIDDLEWARE runs before the profile, so it counts too.
+    stack = list(settings.MIDDLEWARE) + list(profiles.get(ADMIN_PREFIX, []))
+
+    errors = []
+    positions = {}
+    for path, error_id in (
+        (AUTH_MIDDLEWARE, "core.E001"),
+        (MESSAGE_MIDDLEWARE, "core.E002"),
+        (SESSION_MIDDLEWARE, "core.E003"),
+    ):
+        positions[path] = _index_of_subclass(path, stack)
+        if positions[path] is None:
+            errors.append(
+                checks.Error(
+                    f"'{path}' must be in MIDDLEWARE or the '{ADMIN_PREFIX}' entry of "
+                    "HTTPBIN_MIDDLEWARE_PROFILES in order to use the admin application.",
+                    id=error_id,
+                )
+            )
+    session, auth = positions[SESSION_MIDDLEWARE], positions[AUTH_MIDDLEWARE]
+    if session is not None and auth is not None and session > auth:
+        errors.append(
+            checks.Error(
+                f"'{SESSION_MIDDLEWARE}' must come before '{AUTH_MIDDLEWARE}'.",
+                id="core.E004",
+            )
+        )
+    return errors
@@ -0,0 +1,82 @@
+"""
+Request echo helpers shared by every app.
+
+``header_name`` maps a ``request.META`` key to its HTTP header name through a
+bounded cache, so the string munging runs once per distinct key instead of
+once per key per request.
+"""
+
+from functools import lru_cache
+
+from .bodies import should_stream_echo, streamed_body_fields
+
+HEADER_NAME_CACHE_SIZE = 2048
+
+_CONTENT_KEYS = {"CONTENT_TYPE": "Content-Type", "CONTENT_LENGTH": "Content-Length"}
+
+
+@lru_cache(maxsize=HEADER_NAME_CACHE_SIZE)
+def header_name(meta_key):
+    """Header name for a META key, or None if the key is not a header"""
+    if meta_key.startswith("HTTP_"):
+        return meta_key[5:].replace("_", "-").title()
+    return _CONTENT_KEYS.get(meta_key)
+
+
+def extract_headers(request):
+    """Extract all headers from request"""
+    headers = {}
+    for key, value in request.META.items():
+        name = header_name(key)
+        if name is not None:
+            headers[name] = value
+    return headers
+
+
+def get_origin(request):
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def body_fields(request):
+    """
+    The data/files/form/json echo of a DRF request body.
+
+    Bodies above ``HTTPBIN_STREAM_ECHO_THRESHOLD`` are summarized by
+    ``core.bodies.streamed_body_fields`` instead of being parsed.
+    """
+    if should_stream_echo(request):
+        return streamed_body_fields(request)
+    return {
+        "data": request.data,
+        "files": dict(request.FILES),
+        "form": dict(request.POST),
+        "json": request.data if request.content_type == "application/json" else None,
+    }
+
+
+def build_envelope(request, method=None, body=None):
+    """
+    httpbin-style echo of ``request``.
+
+    ``body`` is an optional mapping shaped like ``body_fields()``; its keys are
+    placed where httpbin puts them, so the JSON key order matches httpbin's.
+    A streamed body's summary follows ``json`` as ``body``, and a body that
+    arrived compressed is described by ``compression``.
+    """
+    envelope = {"args": dict(request.GET)}
+    if body is not None:
+        envelope["data"] = body["data"]
+        envelope["files"] = body["files"]
+        envelope["form"] = body["form"]
+    envelope["headers"] = extract_headers(request)
+    if body is not None:
+        envelope["json"] = body["json"]
+        if "body" in body:
+            envelope["body"] = body["body"]
+        compression = getattr(request, "compression", None)
+        if compression is not None:
+            envelope["compression"] = compression
+    envelope["origin"] = get_origin(request)
+    envelope["url"] = request.build_absolute_uri()
+    envelope["method"] = method or request.method
+    return envelope
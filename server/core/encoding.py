@@ -0,0 +1,204 @@
+"""
+Content-coding helpers shared by the compression-aware views and middleware.
+
+Responses are compressed with ``COMPRESSORS``/``StreamCompressor``; request
+bodies in any of ``REQUEST_CODINGS`` are decoded by ``decompress_chunks``.
+"""
+
+import gzip
+import hashlib
+import zlib
+from functools import lru_cache
+
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:  # optional: ``pip install brotli`` enables "br"
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: ``pip install zstandard`` enables zstd request bodies
+    zstandard = None
+
+DECODE_CHUNK_SIZE = 64 * 1024
+
+# Server preference order, used to break ties between equal q-values.
+COMPRESSORS = {
+    "gzip": lambda data: gzip.compress(data, mtime=0),
+    "deflate": zlib.compress,
+}
+if brotli is not None:
+    COMPRESSORS = {"br": brotli.compress, **COMPRESSORS}
+
+CODINGS = tuple(COMPRESSORS)
+
+REQUEST_CODINGS = ("gzip", "deflate") + (("zstd",) if zstandard is not None else ())
+
+
+class StreamCompressor:
+    """
+    Incremental compressor for one response body.
+
+    Every ``compress()`` call flushes, so each input chunk is decodable by the
+    client as soon as it arrives.
+    """
+
+    def __init__(self, coding):
+        self.coding = coding
+        if coding == "br":
+            self._compressor = brotli.Compressor()
+        elif coding == "gzip":
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        else:
+            self._compressor = zlib.compressobj(6)
+
+    def compress(self, chunk):
+        if self.coding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.coding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_chunks(chunks, coding):
+    compressor = StreamCompressor(coding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_chunks(chunks, coding):
+    compressor = StreamCompressor(coding)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class DecompressionError(ValueError):
+    """The body is not valid data for its Content-Encoding"""
+
+
+class CountingReader:
+    """File-like wrapper that counts the bytes read through it"""
+
+    def __init__(self, source):
+        self.source = source
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self.source.read(size)
+        self.count += len(data)
+        return data
+
+
+def decompress_chunks(coding, source, chunk_size=DECODE_CHUNK_SIZE):
+    """
+    Yield the decoded content of ``source`` (a file-like object holding a
+    ``coding``-encoded body) in chunks of at most ``chunk_size`` bytes.
+
+    Output is bounded per step, so a caller can stop as soon as a size limit
+    is crossed without the whole body ever being inflated.
+    """
+    if coding == "zstd":
+        reader = zstandard.ZstdDecompressor().stream_reader(source, read_size=chunk_size)
+        try:
+            while chunk := reader.read(chunk_size):
+                yield chunk
+        except zstandard.ZstdError as exc:
+            raise DecompressionError(str(exc)) from exc
+        return
+
+    wbits = 16 + zlib.MAX_WBITS if coding == "gzip" else zlib.MAX_WBITS
+    decompressor = zlib.decompressobj(wbits)
+    pending = b""
+    try:
+        while True:
+            if decompressor.eof:
+                pending = decompressor.unused_data or source.read(chunk_size)
+                if not pending:
+                    return
+                if coding != "gzip":
+                    raise DecompressionError(f"Trailing data after {coding} body")
+                # RFC 1952 allows several gzip members back to back.
+                decompressor = zlib.decompressobj(wbits)
+            elif not pending:
+                pending = source.read(chunk_size)
+                if not pending:
+                    raise DecompressionError(f"Truncated {coding} body")
+            chunk = decompressor.decompress(pending, chunk_size)
+            if chunk:
+                yield chunk
+            pending = decompressor.unconsumed_tail
+    except zlib.error as exc:
+        raise DecompressionError(str(exc)) from exc
+
+
+@lru_cache(maxsize=256)
+def parse_accept_encoding(header):
+    """Parse an ``Accept-Encoding`` header into a ``{coding: q}`` dict"""
+    codings = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith(("q=", "Q=")):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding] = q
+    return codings
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(header, available):
+    """
+    Pick the best coding from ``available`` for an ``Accept-Encoding`` header.
+
+    Returns None when the identity coding should be used. Codings in
+    ``available`` are in server preference order.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    # Identity is always acceptable but only competes when listed explicitly;
+    # on a tie the compressed coding wins.
+    best, best_q = None, accepted.get("identity", 0.0)
+    for coding in available:
+        q = accepted.get(coding, wildcard)
+        if q > 0 and (q > best_q or (best is None and q == best_q)):
+            best, best_q = coding, q
+    return best
+
+
+def strong_etag(data):
+    return f'"{hashlib.sha1(data).hexdigest()}"'
+
+
+def if_none_match(request, etag):
+    """
+    True if the request's If-None-Match matches ``etag``. This uses the weak
+    comparison, so a ``W/`` tag from CompressionMiddleware sent back by the
+    client still matches.
+    """
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if etags == ["*"]:
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == etag for tag in etags)
@@ -0,0 +1,130 @@
+"""
+Opt-in lightweight dispatch for the hot echo endpoints.
+
+With ``HTTPBIN_FAST_PATH`` on, the app URLconfs route those endpoints through
+``fast_route`` instead of ``APIView.as_view()``. The fast handlers build the
+same payloads as the DRF views and encode them exactly like DRF's
+``JSONRenderer``, so responses are byte-identical while skipping APIView
+dispatch, authentication, permissions and content negotiation.
+
+A handler may return None to hand the request to the DRF view, which is how
+OPTIONS, unsupported methods and bodies the fast path does not parse (e.g.
+multipart) keep DRF's behaviour.
+"""
+
+import json
+
+from django.conf import settings
+from django.http import HttpResponse, QueryDict
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.decorators import api_view
+from rest_framework.utils.encoders import JSONEncoder
+
+from .bodies import should_stream_echo, streamed_body_fields
+
+# Same options as rest_framework.renderers.JSONRenderer with default settings.
+_encoder = JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def render_json(data):
+    text = _encoder.encode(data)
+    # JSONRenderer escapes these so the output is also valid JavaScript.
+    text = text.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+    return text.encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(render_json(data), status=status, content_type="application/json")
+
+
+def _reject_constant(value):
+    raise ValueError(f"Invalid JSON constant {value}")
+
+
+def fast_body_fields(request):
+    """
+    ``core.echo.body_fields`` for a plain Django request.
+
+    Only JSON, urlencoded, empty and streamed (large) bodies are handled;
+    anything else returns None so the DRF parsers deal with it.
+    """
+    if should_stream_echo(request):
+        return streamed_body_fields(request)
+    raw_content_type = request.META.get("CONTENT_TYPE", request.META.get("HTTP_CONTENT_TYPE", ""))
+    is_json = request.content_type == "application/json"
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return None
+    if not content_length:
+        data = {}
+    elif is_json and request.content_params.get("charset", "utf-8").lower() == "utf-8":
+        try:
+            data = json.loads(request.body, parse_constant=_reject_constant)
+        except ValueError:
+            return None
+    elif request.content_type == "application/x-www-form-urlencoded":
+        # Django only parses request.POST for POST; DRF's FormParser takes any method.
+        form = request.POST if request.method == "POST" else QueryDict(request.body, encoding=request.encoding)
+        return {"data": form.dict(), "files": {}, "form": dict(form), "json": None}
+    else:
+        return None
+    return {
+        "data": data,
+        "files": {},
+        "form": {},
+        "json": data if raw_content_type == "application/json" else None,
+    }
+
+
+def fast_route(view_class, handler):
+    """
+    URL callback for ``view_class``: the DRF view, or a fast wrapper around
+    ``handler`` when ``HTTPBIN_FAST_PATH`` is enabled.
+    """
+    drf_view = view_class.as_view()
+    if not getattr(settings, "HTTPBIN_FAST_PATH", False):
+        return drf_view
+
+    instance = view_class()
+    if hasattr(instance, "get") and not hasattr(instance, "head"):
+        # View.setup() does the same before DRF computes its Allow header.
+        instance.head = instance.get
+    allowed = instance.allowed_methods
+    allow = ", ".join(allowed)
+    methods = frozenset(allowed) - {"OPTIONS"}
+
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        response = None
+        if request.method in methods:
+            response = handler(request, *args, **kwargs)
+        if response is None:
+            return drf_view(request, *args, **kwargs)
+        response["Allow"] = allow
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    # Lets drf_yasg keep documenting the endpoint.
+    view.cls = view_class
+    view.initkwargs = {}
+    return view
+
+
+def documented(method, **swagger_kwargs):
+    """
+    Keep a plain Django view in the API docs.
+
+    Builds the ``@swagger_auto_schema``/``@api_view`` view drf_yasg would have
+    seen and copies its class and overrides onto ``view``, the same way
+    ``fast_route`` does; requests are still served by the plain view.
+    """
+    def decorator(view):
+        doc_view = swagger_auto_schema(method=method, **swagger_kwargs)(api_view([method.upper()])(view))
+        view.cls = doc_view.cls
+        view.initkwargs = {}
+        view._swagger_auto_schema = doc_view._swagger_auto_schema
+        return view
+    return decorator
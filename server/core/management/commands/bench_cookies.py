@@ -0,0 +1,65 @@
+import timeit
+
+from django.core import signing
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.http.cookie import parse_cookie
+
+from core.benchmarking import format_summary, measure_wsgi, wsgi_environ
+from cookies.jar import (
+    SET_ATTRIBUTES,
+    CookieSigner,
+    add_preset_cookies,
+    cookie_value,
+    parse_cookie_header,
+)
+
+
+def _set_cookie_loop(names, value):
+    # What SetCookiesView does per key.
+    response = HttpResponse()
+    for name in names:
+        response.set_cookie(name, value)
+    return [morsel.output(header="") for morsel in response.cookies.values()]
+
+
+def _preset(names, value):
+    response = HttpResponse()
+    add_preset_cookies(response, names, value, SET_ATTRIBUTES)
+    return [morsel.output(header="") for morsel in response.cookies.values()]
+
+
+class Command(BaseCommand):
+    help = "Cookie parsing, bulk Set-Cookie and cookie signing costs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cookies", type=int, nargs="+", default=[50, 500, 3000])
+        parser.add_argument("--size", type=int, default=64, help="bytes per cookie value")
+        parser.add_argument("--number", type=int, default=200)
+
+    def _time(self, label, func, number):
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        self.stdout.write(f"  {label:<28} {best / number * 1e6:10.1f} us")
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        value = cookie_value(options["size"])
+        app = WSGIHandler()
+        for count in options["cookies"]:
+            names = [f"c{i}" for i in range(count)]
+            header = "; ".join(f"{name}={value}" for name in names)
+            self.stdout.write(f"{count} cookies, {len(header)} byte Cookie header")
+            self._time("parse_cookie", lambda: parse_cookie(header), number)
+            self._time("parse_cookie_header (cached)", lambda: parse_cookie_header(header), number)
+            self._time("set_cookie loop", lambda: _set_cookie_loop(names, value), number)
+            self._time("preset morsels", lambda: _preset(names, value), number)
+            summary = measure_wsgi(app, lambda: wsgi_environ("/cookies/", headers={"Cookie": header}), number)
+            self.stdout.write("  " + format_summary("GET /cookies/", summary))
+
+        self.stdout.write("signing one cookie")
+        self._time("django signer", lambda: signing.TimestampSigner(salt="bench").sign("value"), number * 10)
+        self._time("cached-key signer", lambda: CookieSigner(salt="bench").sign("value"), number * 10)
+        signed = CookieSigner(salt="bench").sign("value")
+        self._time("django unsign", lambda: signing.TimestampSigner(salt="bench").unsign(signed), number * 10)
+        self._time("cached-key unsign", lambda: CookieSigner(salt="bench").unsign(signed), number * 10)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from core.benchmarking import call_asgi, call_wsgi, format_summary, summarize, wsgi_environ
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire N concurrent /api/delay/<s>/ requests at one worker, first through "
+        "WSGI with a fixed thread pool (like gunicorn --threads) and then "
+        "through ASGI on a single event loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=int, default=1)
+        parser.add_argument("--skip-sync", action="store_true")
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        seconds = options["seconds"]
+        path = f"/api/delay/{seconds}/"
+
+        self.stdout.write(
+            f"{concurrency} concurrent requests to {path} "
+            f"(ideal wall time {seconds} s)"
+        )
+
+        if not options["skip_sync"]:
+            summary = self._run_sync(path, concurrency, options["threads"])
+            self.stdout.write(format_summary(f"wsgi ({options['threads']} threads)", summary))
+            self.stdout.write(f"{'':<24} max in flight: {options['threads']}")
+
+        summary = asyncio.run(self._run_async(path, concurrency))
+        self.stdout.write(format_summary("asgi (1 event loop)", summary))
+        self.stdout.write(f"{'':<24} max in flight: {concurrency}")
+
+    def _run_sync(self, path, concurrency, threads):
+        app = WSGIHandler()
+
+        # Latency is measured from the start of the batch so time spent queued
+        # behind busy threads is counted, as a client would see it.
+        start = time.perf_counter()
+
+        def one():
+            status, _ = call_wsgi(app, wsgi_environ(path))
+            assert status == 200, status
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(pool.map(lambda _: one(), range(concurrency)))
+        return summarize(latencies, time.perf_counter() - start)
+
+    async def _run_async(self, path, concurrency):
+        app = ASGIHandler()
+
+        start = time.perf_counter()
+
+        async def one():
+            status, _ = await call_asgi(app, path)
+            assert status == 200, status
+            return time.perf_counter() - start
+
+        latencies = await asyncio.gather(*(one() for _ in range(concurrency)))
+        return summarize(latencies, time.perf_counter() - start)
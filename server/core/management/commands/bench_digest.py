@@ -0,0 +1,75 @@
+import hashlib
+import secrets
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from auth.utils import DIGEST_ALGORITHMS, digest_ha1, parse_digest_header, validate_digest_response
+
+REALM = "HTTPBin"
+URI = "/auth/digest-auth/auth/user/passwd/MD5/never/"
+
+
+def _legacy_parse(params):
+    # The split(", ") parser HTTPBinDigestAuthentication used before.
+    auth_dict = {}
+    for item in params.split(", "):
+        key, value = item.split("=", 1)
+        auth_dict[key] = value.strip('"')
+    return auth_dict
+
+
+def _legacy_validate(username, password, method, uri, auth_dict):
+    # Previous validate_digest_response: HA1 recomputed on every call.
+    hash_func = DIGEST_ALGORITHMS.get(auth_dict.get("algorithm", "MD5").upper(), hashlib.md5)
+    ha1 = hash_func(f"{username}:{auth_dict['realm']}:{password}".encode()).hexdigest()
+    ha2 = hash_func(f"{method}:{uri}".encode()).hexdigest()
+    expected = hashlib.md5(
+        f"{ha1}:{auth_dict['nonce']}:{auth_dict['nc']}:{auth_dict['cnonce']}:{auth_dict['qop']}:{ha2}".encode()
+    ).hexdigest()
+    return auth_dict["response"] == expected
+
+
+def _authorization(algorithm, username, password):
+    """Params of a correct qop=auth Authorization header for ``algorithm``"""
+    hash_func = DIGEST_ALGORITHMS[algorithm]
+    nonce, cnonce, nc = secrets.token_hex(16), secrets.token_hex(8), "00000001"
+    ha1 = hash_func(f"{username}:{REALM}:{password}".encode()).hexdigest()
+    ha2 = hash_func(f"GET:{URI}".encode()).hexdigest()
+    response = hash_func(f"{ha1}:{nonce}:{nc}:{cnonce}:auth:{ha2}".encode()).hexdigest()
+    return (
+        f'username="{username}", realm="{REALM}", nonce="{nonce}", uri="{URI}", '
+        f'algorithm={algorithm}, qop=auth, nc={nc}, cnonce="{cnonce}", '
+        f'response="{response}", opaque="{secrets.token_hex(16)}"'
+    )
+
+
+class Command(BaseCommand):
+    help = "Digest header parsing and validation throughput per algorithm."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        params = _authorization("MD5", "user", "passwd")
+        parsed = parse_digest_header(params)
+
+        self.stdout.write(f"{number} iterations, best of 5")
+        cases = [
+            ("legacy parse", lambda: _legacy_parse(params)),
+            ("tokenizer parse", lambda: parse_digest_header(params)),
+            ("legacy MD5 validate", lambda: _legacy_validate("user", "passwd", "GET", URI, parsed)),
+        ]
+        for algorithm in DIGEST_ALGORITHMS:
+            auth_dict = parse_digest_header(_authorization(algorithm, "user", "passwd"))
+            assert validate_digest_response("user", "passwd", "GET", URI, auth_dict, algorithm)
+            validate = lambda auth_dict=auth_dict, algorithm=algorithm: validate_digest_response(
+                "user", "passwd", "GET", URI, auth_dict, algorithm
+            )
+            cold = lambda validate=validate: (digest_ha1.cache_clear(), validate())
+            cases += [(f"{algorithm} cold HA1", cold), (f"{algorithm} cached HA1", validate)]
+
+        for label, func in cases:
+            best = min(timeit.repeat(func, number=number, repeat=5))
+            self.stdout.write(f"{label:<22} {best / number * 1e6:8.2f} us  {number / best:12.0f} /s")
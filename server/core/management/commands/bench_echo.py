@@ -0,0 +1,56 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from core.echo import build_envelope, extract_headers
+
+
+def _legacy_extract_headers(request):
+    # The per-view copy every app used to carry, kept here as the baseline.
+    headers = {}
+    for key, value in request.META.items():
+        if key.startswith("HTTP_"):
+            header_name = key[5:].replace("_", "-").title()
+            headers[header_name] = value
+        elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
+            header_name = key.replace("_", "-").title()
+            headers[header_name] = value
+    return headers
+
+
+def _legacy_envelope(request):
+    return {
+        "args": dict(request.GET),
+        "headers": _legacy_extract_headers(request),
+        "origin": request.META.get("REMOTE_ADDR", ""),
+        "url": request.build_absolute_uri(),
+        "method": "GET",
+    }
+
+
+class Command(BaseCommand):
+    help = "Per-request cost of header extraction and the echo envelope."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--headers", type=int, default=60)
+        parser.add_argument("--number", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        extra = {
+            f"HTTP_X_BENCH_HEADER_{i}": f"value-{i}" for i in range(options["headers"])
+        }
+        request = RequestFactory().get("/http_methods/get/?a=1&b=2", HTTP_HOST="localhost", **extra)
+        header_count = len(extract_headers(request))
+        number = options["number"]
+
+        self.stdout.write(f"{header_count} headers, {number} iterations, best of 5")
+        cases = [
+            ("legacy headers", lambda: _legacy_extract_headers(request)),
+            ("core headers", lambda: extract_headers(request)),
+            ("legacy envelope", lambda: _legacy_envelope(request)),
+            ("core envelope", lambda: build_envelope(request, "GET")),
+        ]
+        for label, func in cases:
+            best = min(timeit.repeat(func, number=number, repeat=5))
+            self.stdout.write(f"{label:<20} {best / number * 1e6:9.2f} us/request")
@@ -0,0 +1,52 @@
+import json
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from core.benchmarking import format_summary, measure_wsgi, run_child, wsgi_environ
+
+ENDPOINTS = [
+    ("GET", "/http_methods/get/", "a=1&b=2", b""),
+    ("POST", "/http_methods/post/", "", b'{"key": "value", "items": [1, 2, 3]}'),
+    ("GET", "/inspection/headers/", "", b""),
+    ("GET", "/inspection/ip/", "", b""),
+    ("GET", "/statuscode/status/200/", "", b""),
+]
+
+
+class Command(BaseCommand):
+    help = "Compare req/s and p99 latency of the DRF path and HTTPBIN_FAST_PATH."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=2000)
+        parser.add_argument("--worker", action="store_true", help="internal: measure this process")
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            self.stdout.write(json.dumps(self._measure(options["number"])))
+            return
+
+        args = ["--worker", "--number", str(options["number"])]
+        results = {
+            "drf": run_child("bench_fastpath", args, {"HTTPBIN_FAST_PATH": "0"}),
+            "fast": run_child("bench_fastpath", args, {"HTTPBIN_FAST_PATH": "1"}),
+        }
+        for method, path, _, _ in ENDPOINTS:
+            key = f"{method} {path}"
+            self.stdout.write(key)
+            for mode, summaries in results.items():
+                self.stdout.write("  " + format_summary(mode, summaries[key]))
+            speedup = results["fast"][key]["rps"] / results["drf"][key]["rps"]
+            self.stdout.write(f"  speedup x{speedup:.2f}")
+
+    def _measure(self, number):
+        app = WSGIHandler()
+        results = {}
+        headers = {"User-Agent": "bench/1.0", "Accept": "*/*", "Content-Type": "application/json"}
+        for method, path, query, body in ENDPOINTS:
+            results[f"{method} {path}"] = measure_wsgi(
+                app,
+                lambda: wsgi_environ(path, method, query, headers, body),
+                number,
+            )
+        return results
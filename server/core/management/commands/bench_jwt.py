@@ -0,0 +1,37 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from auth.tokens import JWT_ALGORITHMS, TokenError, decode_token, get_verification_cache, issue_token, verify_token
+
+
+class Command(BaseCommand):
+    help = "JWT verifications per second with and without the verification cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=20000)
+        parser.add_argument("--tokens", type=int, default=100, help="distinct tokens cycled through")
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        self.stdout.write(f"{number} verifications over {options['tokens']} tokens, best of 5")
+        for algorithm in JWT_ALGORITHMS:
+            try:
+                tokens = [issue_token({"sub": f"user-{i}"}, algorithm)[0] for i in range(options["tokens"])]
+            except TokenError as exc:
+                self.stdout.write(f"{algorithm}: skipped ({exc})")
+                continue
+
+            def cycle(verify, tokens=tokens):
+                for token in tokens:
+                    verify(token)
+
+            get_verification_cache().clear()
+            cycle(verify_token)  # warm the cache
+            rounds = max(1, number // len(tokens))
+            for label, verify in (("uncached", decode_token), ("cached", verify_token)):
+                best = min(timeit.repeat(lambda: cycle(verify), number=rounds, repeat=5))
+                count = rounds * len(tokens)
+                self.stdout.write(
+                    f"{algorithm} {label:<9} {best / count * 1e6:8.2f} us  {count / best:12.0f} verifications/s"
+                )
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core.benchmarking import format_summary, measure_wsgi, wsgi_environ
+
+ENDPOINTS = [
+    "/api/health/",
+    "/inspection/ip/",
+    "/http_methods/get/",
+]
+
+PROFILE_MIDDLEWARE = "core.middleware.RouteProfileMiddleware"
+
+
+def _full_stack():
+    """MIDDLEWARE with the /admin/ profile applied globally, as before profiles"""
+    middleware = [path for path in settings.MIDDLEWARE if path != PROFILE_MIDDLEWARE]
+    admin_profile = settings.HTTPBIN_MIDDLEWARE_PROFILES.get("/admin/", [])
+    # Same position the stateful middleware had: after Compression/Common,
+    # before XFrameOptions.
+    return middleware[:-1] + list(admin_profile) + middleware[-1:]
+
+
+class Command(BaseCommand):
+    help = "Per-request overhead of the full middleware stack vs route profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=3000)
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        with override_settings(MIDDLEWARE=_full_stack()):
+            full = WSGIHandler()
+        profiled = WSGIHandler()
+
+        headers = {"User-Agent": "bench/1.0", "Accept": "*/*"}
+        for path in ENDPOINTS:
+            factory = lambda: wsgi_environ(path, headers=headers)
+            results = {
+                "full stack": measure_wsgi(full, factory, number),
+                "route profiles": measure_wsgi(profiled, factory, number),
+            }
+            self.stdout.write(path)
+            for label, summary in results.items():
+                self.stdout.write("  " + format_summary(label, summary))
+            saved = results["full stack"]["p50_ms"] - results["route profiles"]["p50_ms"]
+            self.stdout.write(f"  saved {saved * 1000:.1f} us/request (p50)")
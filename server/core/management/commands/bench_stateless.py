@@ -0,0 +1,80 @@
+import argparse
+import base64
+import json
+import time
+from collections import Counter
+from itertools import cycle
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from core.benchmarking import call_wsgi, run_children, wsgi_environ
+
+PROFILES = {
+    "default": "server.settings",
+    "stateless": "server.settings_stateless",
+}
+
+BASIC_AUTH = "Basic " + base64.b64encode(b"user:passwd").decode()
+
+# (path, extra headers)
+ENDPOINTS = [
+    ("/http_methods/get/", {}),
+    ("/inspection/headers/", {}),
+    ("/cookies/", {}),
+    ("/statuscode/status/200/", {}),
+    ("/api/health/", {}),
+    ("/auth/basic-auth/user/passwd/", {"Authorization": BASIC_AUTH}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregate req/s of concurrent worker processes, server.settings vs "
+        "server.settings_stateless. --basic-auth sends credentials on every request, "
+        "which the default profile checks against the database (migrate first)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--duration", type=float, default=5.0, help="seconds per worker")
+        parser.add_argument("--basic-auth", action="store_true")
+        parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            return self._worker(options)
+
+        args = ["--worker", "--duration", str(options["duration"])]
+        if options["basic_auth"]:
+            args.append("--basic-auth")
+        self.stdout.write(f"{options['workers']} workers x {options['duration']} s, {len(ENDPOINTS)} endpoints")
+        for label, module in PROFILES.items():
+            results = run_children(
+                "bench_stateless", args, env={"DJANGO_SETTINGS_MODULE": module}, count=options["workers"]
+            )
+            requests = sum(result["requests"] for result in results)
+            elapsed = max(result["elapsed"] for result in results)
+            statuses = Counter()
+            for result in results:
+                statuses.update(result["statuses"])
+            self.stdout.write(
+                f"{label:<10} {requests:>8} req  {requests / elapsed:10.1f} req/s  "
+                f"statuses {dict(sorted(statuses.items()))}"
+            )
+
+    def _worker(self, options):
+        app = WSGIHandler()
+        headers = {"User-Agent": "bench/1.0", "Accept": "application/json"}
+        if options["basic_auth"]:
+            headers["Authorization"] = BASIC_AUTH
+        endpoints = cycle([(path, {**headers, **extra}) for path, extra in ENDPOINTS])
+        statuses = Counter()
+        deadline = time.perf_counter() + options["duration"]
+        start = time.perf_counter()
+        while time.perf_counter() < deadline:
+            path, request_headers = next(endpoints)
+            status, _ = call_wsgi(app, wsgi_environ(path, headers=request_headers))
+            statuses[status] += 1
+        elapsed = time.perf_counter() - start
+        self.stdout.write(json.dumps({"requests": sum(statuses.values()), "elapsed": elapsed, "statuses": statuses}))
@@ -0,0 +1,92 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter: boot the WSGI application, then serve one request.
+CHILD = """
+import json, os, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+ready = time.perf_counter()
+from core.benchmarking import call_wsgi, wsgi_environ
+environ = wsgi_environ(os.environ["HTTPBIN_PROFILE_PATH"])
+first = time.perf_counter()
+status, _ = call_wsgi(application, environ)
+done = time.perf_counter()
+print(json.dumps({
+    "status": status,
+    "setup_ms": (ready - start) * 1000,
+    "first_request_ms": (done - first) * 1000,
+}))
+"""
+
+CONFIGS = {
+    "default": {"HTTPBIN_LEAN": "0"},
+    "lean": {"HTTPBIN_LEAN": "1"},
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _run(env, path, importtime=False):
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", CHILD]
+    result = subprocess.run(
+        command,
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "server.settings"),
+            "HTTPBIN_PROFILE_PATH": path,
+            **env,
+        },
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def _import_costs(stderr, by):
+    """Self import time in microseconds per module or top-level package"""
+    costs = defaultdict(int)
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            name = match[4] if by == "module" else match[4].split(".", 1)[0]
+            costs[name] += int(match[1])
+    return costs
+
+
+class Command(BaseCommand):
+    help = "Startup profile: import cost and time-to-first-request, default vs HTTPBIN_LEAN."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/http_methods/get/", help="URL for the first request")
+        parser.add_argument("--repeat", type=int, default=7, help="boots per configuration (best is reported)")
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--by", choices=("package", "module"), default="package")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        for label, env in CONFIGS.items():
+            runs = [_run(env, path)[0] for _ in range(options["repeat"])]
+            setup = min(run["setup_ms"] for run in runs)
+            first = min(run["first_request_ms"] for run in runs)
+            _, stderr = _run(env, path, importtime=True)
+            costs = _import_costs(stderr, options["by"])
+
+            self.stdout.write(
+                f"{label}: setup {setup:.1f} ms, first request {first:.1f} ms "
+                f"(HTTP {runs[0]['status']}), time to first response {setup + first:.1f} ms"
+            )
+            self.stdout.write(f"  {len(costs)} {options['by']}s imported, {sum(costs.values()) / 1000:.1f} ms self time")
+            ranked = sorted(costs.items(), key=lambda item: item[1], reverse=True)
+            for name, micros in ranked[: options["top"]]:
+                self.stdout.write(f"  {micros / 1000:8.1f} ms  {name}")
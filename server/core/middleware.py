@@ -0,0 +1,291 @@
+import re
+from tempfile import SpooledTemporaryFile
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.exception import convert_exception_to_response
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.module_loading import import_string
+
+from .bodies import content_length, is_chunked
+from .encoding import (
+    CODINGS,
+    COMPRESSORS,
+    REQUEST_CODINGS,
+    CountingReader,
+    DecompressionError,
+    acompress_chunks,
+    compress_chunks,
+    decompress_chunks,
+    negotiate_encoding,
+)
+
+# Bodies that are already compressed gain nothing from a second pass, and
+# octet-stream is mostly random bytes (/api/bytes, /api/stream-bytes) that
+# would only come out larger.
+_INCOMPRESSIBLE_TYPES = (
+    "application/gzip",
+    "application/x-gzip",
+    "application/zlib",
+    "application/zstd",
+    "application/octet-stream",
+)
+
+_no_transform_re = re.compile(r"\bno-transform\b")
+
+
+class CompressionMiddleware:
+    """
+    Compress responses from every app according to ``Accept-Encoding``.
+
+    Regular bodies shorter than ``HTTPBIN_COMPRESSION_MIN_SIZE`` are left
+    alone. Streaming bodies are compressed chunk by chunk, flushing after each
+    one, so drip/stream endpoints keep their time to first byte. Works under
+    both WSGI and ASGI without a thread hop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "HTTPBIN_COMPRESSION_MIN_SIZE", 200)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if not self._compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), CODINGS)
+        if coding is None:
+            return response
+
+        if response.streaming:
+            content_length = response.get("Content-Length")
+            if content_length is not None and int(content_length) < self.min_size:
+                return response
+            if response.is_async:
+                response.streaming_content = acompress_chunks(response.streaming_content, coding)
+            else:
+                response.streaming_content = compress_chunks(response.streaming_content, coding)
+            del response["Content-Length"]
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            compressed = COMPRESSORS[coding](response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = coding
+        return response
+
+    def _compressible(self, response):
+        if response.status_code != 200 or response.has_header("Content-Encoding"):
+            return False
+        # Byte ranges address the identity body; compressing would break resumes.
+        if response.get("Accept-Ranges") == "bytes":
+            return False
+        if _no_transform_re.search(response.get("Cache-Control", "")):
+            return False
+        return not response.get("Content-Type", "").startswith(_INCOMPRESSIBLE_TYPES)
+
+
+# The ratio guard only applies past this many decoded bytes, so small,
+# highly repetitive bodies (e.g. JSON full of zeros) are not rejected.
+RATIO_CHECK_MIN_SIZE = 1024 * 1024
+
+
+class RequestDecompressionMiddleware:
+    """
+    Decode request bodies sent with ``Content-Encoding`` gzip, deflate or zstd
+    (with ``zstandard`` installed) before any parser sees them.
+
+    The body is inflated incrementally into a spooled file and the request is
+    rejected with 413 as soon as it exceeds ``HTTPBIN_DECOMPRESS_MAX_SIZE`` or
+    ``HTTPBIN_DECOMPRESS_MAX_RATIO`` times the compressed bytes read so far.
+    Undecodable bodies get 400 and unknown codings 415. The sizes are kept on
+    ``request.compression`` for the echo endpoints. Paths starting with one of
+    ``HTTPBIN_DECOMPRESS_EXEMPT_PATHS`` are left encoded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_size = settings.HTTPBIN_DECOMPRESS_MAX_SIZE
+        self.max_ratio = settings.HTTPBIN_DECOMPRESS_MAX_RATIO
+        self.exempt_paths = tuple(getattr(settings, "HTTPBIN_DECOMPRESS_EXEMPT_PATHS", ()))
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self._should_decode(request):
+            response = self.decode(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self._should_decode(request):
+            response = await sync_to_async(self.decode)(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def _should_decode(self, request):
+        return "HTTP_CONTENT_ENCODING" in request.META and not request.path_info.startswith(self.exempt_paths)
+
+    def decode(self, request):
+        """Swap the request's body for its decoded form; returns an error response on failure"""
+        coding = request.META["HTTP_CONTENT_ENCODING"].strip().lower()
+        if coding in ("", "identity") or content_length(request) == 0:
+            return None
+        if coding not in REQUEST_CODINGS:
+            return JsonResponse(
+                {"error": f"Unsupported Content-Encoding: {coding}", "supported": list(REQUEST_CODINGS)},
+                status=415,
+            )
+
+        # Django has no public hook for replacing the body stream, so read the
+        # raw stream and install the decoded one in its place.
+        source = CountingReader(request.META["wsgi.input"] if is_chunked(request) else request._stream)
+        decoded = SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+        size = 0
+        try:
+            for chunk in decompress_chunks(coding, source):
+                size += len(chunk)
+                if size > self.max_size:
+                    return self._reject(decoded, f"Decompressed body exceeds {self.max_size} bytes")
+                if size > RATIO_CHECK_MIN_SIZE and size > self.max_ratio * source.count:
+                    return self._reject(decoded, f"Compression ratio exceeds {self.max_ratio}")
+                decoded.write(chunk)
+        except DecompressionError as exc:
+            decoded.close()
+            return JsonResponse({"error": f"Invalid {coding} body: {exc}"}, status=400)
+
+        decoded.seek(0)
+        request._stream = decoded
+        request.META["CONTENT_LENGTH"] = str(size)
+        request.compression = {
+            "content_encoding": coding,
+            "compressed_size": source.count,
+            "decompressed_size": size,
+        }
+        return None
+
+    @staticmethod
+    def _reject(decoded, message):
+        decoded.close()
+        return JsonResponse({"error": message}, status=413)
+
+
+class RouteProfileMiddleware:
+    """
+    Run extra middleware only for the path prefixes that need it.
+
+    ``HTTPBIN_MIDDLEWARE_PROFILES`` maps a path prefix to a list of middleware
+    paths, e.g. sessions/CSRF/auth/messages for ``/admin/``. Requests under a
+    prefix go through that stack; every other request (the stateless httpbin
+    endpoints) goes straight on without touching it.
+
+    Django only registers process_view/process_exception/
+    process_template_response for middleware listed in ``settings.MIDDLEWARE``,
+    so this class forwards those hooks to the matching profile. Keep it last in
+    ``MIDDLEWARE`` so the profiles run closest to the view, as they would if
+    listed there directly.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+        self.profiles = {}
+        profiles = getattr(settings, "HTTPBIN_MIDDLEWARE_PROFILES", {})
+        # Longest prefix first so nested prefixes pick the most specific stack.
+        for prefix in sorted(profiles, key=len, reverse=True):
+            self.profiles[prefix] = self._build(profiles[prefix])
+        self.prefixes = tuple(self.profiles)
+
+    def _build(self, middleware_paths):
+        handler = self.get_response
+        instances = []
+        for path in reversed(middleware_paths):
+            middleware = import_string(path)
+            if self.async_mode and not getattr(middleware, "async_capable", False):
+                raise ImproperlyConfigured(f"{path} must be async-capable to be used in a profile under ASGI.")
+            instance = middleware(handler)
+            instances.insert(0, instance)
+            handler = convert_exception_to_response(instance)
+        return handler, instances
+
+    def _match(self, request):
+        path = request.path_info
+        if path.startswith(self.prefixes):
+            for prefix in self.prefixes:
+                if path.startswith(prefix):
+                    return self.profiles[prefix]
+        return None
+
+    def __call__(self, request):
+        profile = self._match(request)
+        if profile is None:
+            return self.get_response(request)
+        return profile[0](request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = self._match(request)
+        if profile is None:
+            return None
+        for instance in profile[1]:
+            if hasattr(instance, "process_view"):
+                response = instance.process_view(request, view_func, view_args, view_kwargs)
+                if response is not None:
+                    return response
+        return None
+
+    def process_template_response(self, request, response):
+        profile = self._match(request)
+        if profile is not None:
+            for instance in reversed(profile[1]):
+                if hasattr(instance, "process_template_response"):
+                    response = instance.process_template_response(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        profile = self._match(request)
+        if profile is None:
+            return None
+        for instance in reversed(profile[1]):
+            if hasattr(instance, "process_exception"):
+                response = instance.process_exception(request, exception)
+                if response is not None:
+                    return response
+        return None
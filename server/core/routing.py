@@ -0,0 +1,16 @@
+"""
+URL routing helpers.
+"""
+
+
+def lazy_include(urlconf_module, namespace=None):
+    """
+    ``include()`` that does not import ``urlconf_module`` up front.
+
+    ``include("dotted.path")`` imports the module immediately, whereas
+    ``path()`` given the (module, app_name, namespace) triple keeps the dotted
+    path on the URLResolver, which imports it the first time a URL under the
+    prefix is resolved or any URL is reversed. The module's ``app_name`` is
+    not read, so pass the namespace here.
+    """
+    return (urlconf_module, namespace, namespace)
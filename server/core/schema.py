@@ -0,0 +1,89 @@
+"""
+OpenAPI schema views that serve cached, pre-serialized documents.
+
+drf_yasg walks every view and rebuilds the document on each spec request.
+``get_cached_schema_view`` renders it once per (version, format, host) and
+keeps the bytes together with a strong ETag. The cache is dropped whenever
+the URL resolver is rebuilt (``clear_url_caches()``, a ROOT_URLCONF change),
+which is the only time the document can change.
+"""
+
+import threading
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import get_resolver
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer
+from drf_yasg.views import get_schema_view
+
+from .encoding import if_none_match, strong_etag
+
+SPEC_RENDERERS = (OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer)
+MAX_CACHED_DOCUMENTS = 32
+
+
+class SchemaCache:
+    """Serialized documents keyed by (version, format, base URL)"""
+
+    def __init__(self, urlconf=None, max_entries=MAX_CACHED_DOCUMENTS):
+        self.urlconf = urlconf
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._resolver = None
+        self._entries = {}
+
+    def get(self, key, build):
+        resolver = get_resolver(self.urlconf)
+        with self._lock:
+            if resolver is not self._resolver:
+                self._resolver = resolver
+                self._entries.clear()
+            entry = self._entries.get(key)
+        if entry is None:
+            # Built outside the lock; a concurrent miss just renders twice.
+            entry = build()
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_cached_schema_view(*args, **kwargs):
+    """``drf_yasg.views.get_schema_view`` with cached spec documents"""
+    base_view = get_schema_view(*args, **kwargs)
+    cache = SchemaCache(kwargs.get("urlconf"))
+
+    class CachedSchemaView(base_view):
+        schema_cache = cache
+
+        def get(self, request, version="", format=None):
+            renderer = request.accepted_renderer
+            # UI pages are generated from an empty pattern list and are cheap;
+            # non-public schemas depend on the user.
+            if not isinstance(renderer, SPEC_RENDERERS) or not self.public:
+                return super().get(request, version, format)
+
+            key = (request.version or version or "", renderer.format, request.build_absolute_uri("/"))
+            body, etag = self.schema_cache.get(
+                key, lambda: self._render_document(request, version, format, renderer)
+            )
+
+            if if_none_match(request, etag):
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(
+                    body, content_type=f"{request.accepted_media_type}; charset={renderer.charset}"
+                )
+            response["ETag"] = etag
+            return response
+
+        def _render_document(self, request, version, format, renderer):
+            schema = super().get(request, version, format).data
+            body = renderer.render(schema, request.accepted_media_type, self.get_renderer_context())
+            return body, f'{strong_etag(body)[:-1]}-{renderer.format}"'
+
+    return CachedSchemaView
@@ -0,0 +1,36 @@
+"""
+Streaming responses that suit the server they run under.
+
+``StreamingHttpResponse`` buffers an iterator of the wrong kind for the
+server completely before sending it, so under ASGI ``streaming_response``
+wraps sync chunk generators in an async iterator; under WSGI they are passed
+through unchanged. Chunks are produced in a worker thread, so generators that
+verify tokens or read the request body never block the event loop.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+
+def is_asgi(request):
+    """Whether ``request`` (an HttpRequest or a DRF Request) came in over ASGI"""
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+_EXHAUSTED = object()
+
+
+async def aiterate(iterator):
+    """Async iterator over a sync one, advancing it in a worker thread"""
+    iterator = iter(iterator)
+    fetch = sync_to_async(next, thread_sensitive=False)
+    while (chunk := await fetch(iterator, _EXHAUSTED)) is not _EXHAUSTED:
+        yield chunk
+
+
+def streaming_response(request, chunks, content_type, **kwargs):
+    """``StreamingHttpResponse`` over ``chunks``, async under ASGI"""
+    if is_asgi(request):
+        chunks = aiterate(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type, **kwargs)
@@ -0,0 +1,504 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import zlib
+from unittest import mock, skipIf, skipUnless
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.client import MULTIPART_CONTENT
+from rest_framework.response import Response
+
+from http_methods import views as http_methods_views
+from inspection import views as inspection_views
+from statuscode import views as statuscode_views
+
+from .asgi import BodySinkApplication
+from .checks import check_admin_profile
+from .fastpath import fast_route
+from .middleware import CompressionMiddleware
+
+SCHEMA_URL = "/swagger/?format=openapi"
+
+# (view class, fast handler) for every endpoint routed through fast_route.
+FAST_ROUTES = {
+    "get": (http_methods_views.GetView, http_methods_views.fast_get),
+    "post": (http_methods_views.PostView, http_methods_views.fast_body),
+    "put": (http_methods_views.PutView, http_methods_views.fast_body),
+    "patch": (http_methods_views.PatchView, http_methods_views.fast_body),
+    "delete": (http_methods_views.DeleteView, http_methods_views.fast_delete),
+    "headers": (inspection_views.HeadersView, inspection_views.fast_headers),
+    "ip": (inspection_views.IPView, inspection_views.fast_ip),
+    "user-agent": (inspection_views.UserAgentView, inspection_views.fast_user_agent),
+    "uuid": (inspection_views.UUIDView, inspection_views.fast_uuid),
+    "response-headers": (inspection_views.ResponseHeadersView, inspection_views.fast_response_headers),
+    "status": (statuscode_views.StatusCodeView, statuscode_views.fast_status),
+}
+
+
+class SchemaETagTests(SimpleTestCase):
+    def test_weak_etag_from_compression_revalidates(self):
+        first = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Content-Encoding"], "gzip")
+        self.assertTrue(first["ETag"].startswith("W/"))
+
+        second = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+
+    def test_strong_etag_revalidates(self):
+        first = self.client.get(SCHEMA_URL)
+        second = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+
+    def test_wildcard_matches(self):
+        response = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_etag_gets_full_schema(self):
+        response = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, 200)
+
+
+class FastPathTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    def views(self, name):
+        view_class, handler = FAST_ROUTES[name]
+        handler = mock.Mock(wraps=handler)
+        with override_settings(HTTPBIN_FAST_PATH=False):
+            drf_view = fast_route(view_class, handler)
+        with override_settings(HTTPBIN_FAST_PATH=True):
+            fast_view = fast_route(view_class, handler)
+        self.assertIsNot(drf_view, fast_view)
+        return drf_view, fast_view, handler
+
+    def call(self, view, method, path, data="", content_type="application/json", kwargs=None, **extra):
+        request = self.factory.generic(method, path, data, content_type, HTTP_USER_AGENT="t\u00e9st", **extra)
+        response = view(request, **(kwargs or {}))
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def assertSameResponse(self, name, method, path, **options):
+        drf_view, fast_view, handler = self.views(name)
+        with mock.patch("inspection.views.uuid_lib.uuid4", return_value="fixed-uuid"):
+            expected = self.call(drf_view, method, path, **options)
+            actual = self.call(fast_view, method, path, **options)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+        for header in ("Allow", "Vary", "Content-Type"):
+            self.assertEqual(actual.get(header), expected.get(header), header)
+        return actual, handler
+
+    def test_fast_responses_match_drf(self):
+        cases = [
+            ("get", "GET", "/http_methods/get/?a=1&a=2&b=\u2028"),
+            ("get", "HEAD", "/http_methods/get/"),
+            ("post", "POST", "/http_methods/post/", {"data": '{"a": [1, "\u00e9"]}'}),
+            ("post", "POST", "/http_methods/post/", {"data": "a=1&a=2", "content_type": "application/x-www-form-urlencoded"}),
+            ("put", "PUT", "/http_methods/put/", {"data": "a=1&b=2", "content_type": "application/x-www-form-urlencoded"}),
+            ("patch", "PATCH", "/http_methods/patch/"),
+            ("delete", "DELETE", "/http_methods/delete/?x=y"),
+            ("headers", "GET", "/inspection/headers/", {"HTTP_X_CUSTOM": "value"}),
+            ("ip", "GET", "/inspection/ip/", {"HTTP_X_FORWARDED_FOR": "10.0.0.1, 10.0.0.2"}),
+            ("user-agent", "GET", "/inspection/user-agent/"),
+            ("uuid", "GET", "/inspection/uuid/"),
+            ("response-headers", "GET", "/inspection/response-headers/?X-Test=1"),
+            ("status", "GET", "/statuscode/status/418/", {"kwargs": {"codes": "418"}}),
+            ("status", "GET", "/statuscode/status/999/", {"kwargs": {"codes": "999"}}),
+        ]
+        for name, method, path, *options in cases:
+            with self.subTest(name=name, method=method, path=path):
+                response, handler = self.assertSameResponse(name, method, path, **(options[0] if options else {}))
+                handler.assert_called_once()
+                self.assertNotIsInstance(response, Response)
+
+    def test_response_headers_match_drf(self):
+        response, _ = self.assertSameResponse("response-headers", "GET", "/inspection/response-headers/?X-Test=1")
+        self.assertEqual(response["X-Test"], "1")
+
+    def test_options_falls_back_to_drf(self):
+        response, handler = self.assertSameResponse("post", "OPTIONS", "/http_methods/post/")
+        handler.assert_not_called()
+        self.assertIsInstance(response, Response)
+
+    def test_disallowed_method_falls_back_to_drf(self):
+        response, handler = self.assertSameResponse("post", "GET", "/http_methods/post/")
+        handler.assert_not_called()
+        self.assertEqual(response.status_code, 405)
+
+    def test_multipart_falls_back_to_drf(self):
+        data = self.factory._encode_data({"a": "1"}, MULTIPART_CONTENT)
+        response, handler = self.assertSameResponse(
+            "post", "POST", "/http_methods/post/", data=data, content_type=MULTIPART_CONTENT
+        )
+        handler.assert_called_once()
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.data["form"], {"a": ["1"]})
+
+    def test_invalid_json_falls_back_to_drf(self):
+        response, handler = self.assertSameResponse("post", "POST", "/http_methods/post/", data="{nope")
+        handler.assert_called_once()
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(HTTPBIN_COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"key": "value"}' * 50
+
+    def process(self, response, accept_encoding="gzip"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        response = self.process(HttpResponse(self.body, content_type="application/json"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_deflate(self):
+        response = self.process(HttpResponse(self.body), "deflate, gzip;q=0.5")
+        self.assertEqual(response["Content-Encoding"], "deflate")
+        self.assertEqual(zlib.decompress(response.content), self.body)
+
+    def test_identity_only(self):
+        for accept_encoding in ("", "identity", "gzip;q=0"):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.process(HttpResponse(self.body), accept_encoding)
+                self.assertFalse(response.has_header("Content-Encoding"))
+                self.assertEqual(response.content, self.body)
+
+    def test_skip_rules(self):
+        def response(**headers):
+            result = HttpResponse(self.body, status=headers.pop("status", 200))
+            for name, value in headers.items():
+                result[name.replace("_", "-")] = value
+            return result
+
+        cases = {
+            "below min size": HttpResponse(b"x" * 199),
+            "not 200": response(status=404),
+            "already encoded": response(Content_Encoding="br"),
+            "byte ranges": response(Accept_Ranges="bytes"),
+            "no-transform": response(Cache_Control="public, no-transform"),
+            "gzip media type": response(Content_Type="application/gzip"),
+            "octet-stream": response(Content_Type="application/octet-stream"),
+        }
+        for reason, original in cases.items():
+            with self.subTest(reason):
+                content = original.content
+                result = self.process(original)
+                self.assertNotEqual(result.get("Content-Encoding"), "gzip")
+                self.assertEqual(result.content, content)
+
+    def test_strong_etag_is_weakened(self):
+        original = HttpResponse(self.body)
+        original["ETag"] = '"abc"'
+        self.assertEqual(self.process(original)["ETag"], 'W/"abc"')
+
+        weak = HttpResponse(self.body)
+        weak["ETag"] = 'W/"abc"'
+        self.assertEqual(self.process(weak)["ETag"], 'W/"abc"')
+
+    def test_sync_streaming_response(self):
+        chunks = [self.body[:100], self.body[100:]]
+        response = self.process(StreamingHttpResponse(iter(chunks)))
+        self.assertFalse(response.is_async)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), self.body)
+
+    async def test_async_streaming_response(self):
+        async def chunks():
+            yield self.body[:100]
+            yield self.body[100:]
+
+        response = self.process(StreamingHttpResponse(chunks()), "deflate")
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(zlib.decompress(content), self.body)
+
+    def test_stream_endpoint(self):
+        response = self.client.get("/api/stream/3/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        lines = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def test_random_bytes_are_not_compressed(self):
+        response = self.client.get("/api/stream-bytes/5000/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(b"".join(response.streaming_content)), 5000)
+
+
+ADMIN_INSTALLED = apps.is_installed("django.contrib.admin")
+
+
+@skipUnless(ADMIN_INSTALLED, "the admin is not installed (server.settings_stateless)")
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class RouteProfileTests(TestCase):
+    def login(self, client):
+        User.objects.create_superuser("admin", "admin@example.com", "password")
+        client.get("/admin/login/")
+        return client.post(
+            "/admin/login/?next=/admin/",
+            {"username": "admin", "password": "password", "csrfmiddlewaretoken": client.cookies["csrftoken"].value},
+        )
+
+    def test_admin_enforces_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post("/admin/login/", {"username": "admin", "password": "password"})
+        self.assertEqual(response.status_code, 403)
+
+    def test_admin_login_with_sessions_and_messages(self):
+        client = Client(enforce_csrf_checks=True)
+        response = self.login(client)
+        self.assertRedirects(response, "/admin/")
+        self.assertIn("sessionid", client.cookies)
+        self.assertEqual(client.get("/admin/").status_code, 200)
+
+        add_url = "/admin/auth/group/add/"
+        client.get(add_url)
+        response = client.post(
+            add_url, {"name": "testers", "csrfmiddlewaretoken": client.cookies["csrftoken"].value}, follow=True
+        )
+        self.assertEqual(response.status_code, 200)
+        messages = [str(message) for message in response.context["messages"]]
+        self.assertEqual(len(messages), 1)
+        self.assertIn("was added successfully", messages[0])
+
+    def test_httpbin_routes_skip_the_stack(self):
+        client = Client(enforce_csrf_checks=True)
+        self.login(client)
+        response = client.post("/http_methods/post/", {"a": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertNotIn("sessionid", response.cookies)
+        self.assertNotIn("csrftoken", response.cookies)
+        self.assertNotIn("Cookie", client.get("/inspection/headers/").get("Vary", ""))
+
+    def test_admin_profile_check_passes(self):
+        self.assertEqual(check_admin_profile(None), [])
+
+    def test_admin_profile_check_reports_missing_middleware(self):
+        with override_settings(HTTPBIN_MIDDLEWARE_PROFILES={}):
+            errors = check_admin_profile(None)
+        self.assertEqual([error.id for error in errors], ["core.E001", "core.E002", "core.E003"])
+
+    def test_admin_profile_check_reports_order(self):
+        profile = [
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+        ]
+        with override_settings(HTTPBIN_MIDDLEWARE_PROFILES={"/admin/": profile}):
+            errors = check_admin_profile(None)
+        self.assertEqual([error.id for error in errors], ["core.E004"])
+
+
+@skipIf(ADMIN_INSTALLED, "run with --settings=server.settings_stateless")
+class StatelessProfileTests(SimpleTestCase):
+    def test_no_database_is_configured(self):
+        self.assertEqual(settings.DATABASES["default"]["ENGINE"], "django.db.backends.dummy")
+
+    def test_basic_authorization_on_echo_runs_no_query(self):
+        # SimpleTestCase fails any query; with DRF's BasicAuthentication this
+        # header would be checked against the user table.
+        credentials = base64.b64encode(b"user:passwd").decode()
+        for url in ("/http_methods/get/", "/inspection/headers/"):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_AUTHORIZATION=f"Basic {credentials}")
+                self.assertEqual(response.status_code, 200)
+        response = self.client.get("/auth/basic-auth/user/passwd/", HTTP_AUTHORIZATION=f"Basic {credentials}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_admin_is_not_routed(self):
+        self.assertEqual(self.client.get("/admin/").status_code, 404)
+        self.assertEqual(self.client.get("/admin/login/").status_code, 404)
+
+
+class LazyURLConfTests(SimpleTestCase):
+    # Fresh interpreter: serve the given paths, then report which lazily
+    # included URLconfs were imported.
+    CHILD = """
+import json, sys
+from django.core.wsgi import get_wsgi_application
+from core.benchmarking import call_wsgi, wsgi_environ
+application = get_wsgi_application()
+statuses = [call_wsgi(application, wsgi_environ(path))[0] for path in sys.argv[1:]]
+loaded = [name for name in ("server.docs_urls", "server.admin_urls") if name in sys.modules]
+print(json.dumps({"statuses": statuses, "loaded": loaded}))
+"""
+
+    def serve(self, *paths):
+        result = subprocess.run(
+            [sys.executable, "-c", self.CHILD, *paths],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "server.settings"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_redirects_and_unmatched_paths_skip_docs_and_admin(self):
+        paths = ("/statuscode/relative-redirect/2/", "/statuscode/absolute-redirect/1/", "/no-such-path/")
+        self.assertEqual(self.serve(*paths), {"statuses": [302, 302, 404], "loaded": []})
+
+    def test_docs_are_loaded_on_demand(self):
+        served = self.serve("/redoc/")
+        self.assertEqual(served["statuses"], [200])
+        self.assertIn("server.docs_urls", served["loaded"])
+
+
+class BodySinkApplicationTests(SimpleTestCase):
+    async def call(self, method, path, chunks, headers=()):
+        messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+        messages.append({"type": "http.request", "body": b"", "more_body": False})
+        sent = []
+        passed = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        async def django_app(scope, receive, send):
+            passed.append(scope["path"])
+
+        app = BodySinkApplication(django_app, ["/api/sink/"])
+        scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+        await app(scope, receive, send)
+        return sent, passed
+
+    async def test_counts_bytes_and_chunks(self):
+        sent, passed = await self.call("POST", "/api/sink/", [b"a" * 10, b"b" * 20, b"c" * 5])
+        self.assertEqual(passed, [])
+        self.assertEqual(sent[0]["status"], 200)
+        stats = json.loads(sent[1]["body"])
+        self.assertEqual((stats["bytes"], stats["chunks"], stats["chunked"]), (35, 3, True))
+
+    async def test_content_length_is_not_chunked(self):
+        sent, _ = await self.call("PUT", "/api/sink/", [b"abc"], headers=[(b"content-length", b"3")])
+        stats = json.loads(sent[1]["body"])
+        self.assertEqual((stats["bytes"], stats["chunks"], stats["chunked"]), (3, 1, False))
+
+    async def test_get_is_passed_to_django(self):
+        # Django's sink_view answers the GET with 405.
+        sent, passed = await self.call("GET", "/api/sink/", [])
+        self.assertEqual((sent, passed), ([], ["/api/sink/"]))
+
+    async def test_other_paths_are_passed_to_django(self):
+        sent, passed = await self.call("POST", "/http_methods/post/", [b"{}"])
+        self.assertEqual((sent, passed), ([], ["/http_methods/post/"]))
+
+    async def test_get_through_django_is_not_allowed(self):
+        response = await self.async_client.get("/api/sink/")
+        self.assertEqual(response.status_code, 405)
+
+
+class RequestDecompressionTests(SimpleTestCase):
+    def post(self, body, coding):
+        return self.client.post(
+            "/http_methods/post/", body, content_type="application/json", HTTP_CONTENT_ENCODING=coding
+        )
+
+    def test_gzip_body_is_decoded(self):
+        response = self.post(gzip.compress(b'{"a": 1}'), "gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["json"], {"a": 1})
+        self.assertEqual(response.json()["compression"]["decompressed_size"], 8)
+
+    def test_multi_member_gzip_body_is_decoded_in_full(self):
+        body = gzip.compress(b'{"a": 1, ') + gzip.compress(b'"b": 2}')
+        response = self.post(body, "gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["json"], {"a": 1, "b": 2})
+
+    def test_trailing_garbage_after_gzip_is_rejected(self):
+        response = self.post(gzip.compress(b"{}") + b"garbage", "gzip")
+        self.assertEqual(response.status_code, 400)
+
+    def test_trailing_data_after_deflate_is_rejected(self):
+        response = self.post(zlib.compress(b"{}") + zlib.compress(b"{}"), "deflate")
+        self.assertEqual(response.status_code, 400)
+
+    def test_truncated_body_is_rejected(self):
+        response = self.post(gzip.compress(b"[0]" * 100)[:-10], "gzip")
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(HTTPBIN_STREAM_ECHO_THRESHOLD=1000)
+class StreamedEchoTests(SimpleTestCase):
+    def test_large_bodies_are_summarized(self):
+        body = b'{"a": "' + b"x" * 2000 + b'"}'
+        for method in ("PUT", "PATCH", "POST"):
+            with self.subTest(method=method):
+                url = f"/http_methods/{method.lower()}/"
+                response = self.client.generic(method, url, body, content_type="application/json")
+                self.assertEqual(response.status_code, 200)
+                data = response.json()
+                self.assertEqual(data["data"], "")
+                self.assertIsNone(data["json"])
+                self.assertEqual(data["body"]["length"], len(body))
+                self.assertEqual(data["body"]["md5"], hashlib.md5(body).hexdigest())
+                self.assertEqual(data["body"]["sha256"], hashlib.sha256(body).hexdigest())
+
+    def test_body_at_threshold_is_parsed(self):
+        body = b'"' + b"x" * 998 + b'"'
+        for method in ("PUT", "PATCH"):
+            with self.subTest(method=method):
+                url = f"/http_methods/{method.lower()}/"
+                response = self.client.generic(method, url, body, content_type="application/json")
+                self.assertEqual(response.json()["json"], "x" * 998)
+                self.assertNotIn("body", response.json())
+
+
+@override_settings(HTTPBIN_STREAM_ECHO_THRESHOLD=1000)
+class ChunkedEchoTests(SimpleTestCase):
+    def post(self, url, body, content_type="application/json"):
+        # No Content-Length: the body arrives as the server de-chunked it.
+        environ = {"wsgi.input": io.BytesIO(body), "wsgi.input_terminated": True}
+        return self.client.post(url, body, content_type=content_type, CONTENT_LENGTH="", **environ)
+
+    def test_small_chunked_body_is_parsed(self):
+        response = self.post("/http_methods/post/", b'{"a": 1}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["json"], {"a": 1})
+        self.assertNotIn("body", response.json())
+
+    def test_large_chunked_body_is_streamed(self):
+        body = b'["' + b"x" * 2000 + b'"]'
+        response = self.post("/http_methods/post/", body)
+        self.assertEqual(response.status_code, 200)
+        summary = response.json()["body"]
+        self.assertEqual(summary["length"], len(body))
+        self.assertEqual(summary["sha256"], hashlib.sha256(body).hexdigest())
+        self.assertEqual(response.json()["data"], "")
+
+    def test_chunked_body_at_threshold_is_parsed(self):
+        body = b'"' + b"x" * 998 + b'"'
+        response = self.post("/http_methods/post/", body)
+        self.assertEqual(response.json()["json"], "x" * 998)
+
+    def test_large_chunked_body_is_streamed_on_anything(self):
+        body = b"y" * 5000
+        response = self.post("/http_methods/anything", body, content_type="text/plain")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["body"]["length"], len(body))
+        self.assertEqual(response.json()["body"]["md5"], hashlib.md5(body).hexdigest())
+
+    def test_small_chunked_body_on_anything(self):
+        response = self.post("/http_methods/anything", b"hello", content_type="text/plain")
+        self.assertEqual(response.json()["data"], "hello")
@@ -1,3 +1,83 @@
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, SimpleTestCase
 
-# Create your tests here.
+from core.fastpath import fast_body_fields
+
+from .views import ANYTHING_ALLOW
+
+
+class AnythingTests(SimpleTestCase):
+    def test_get_with_path(self):
+        response = self.client.get("/http_methods/anything/a/b?x=1")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["method"], "GET")
+        self.assertEqual(data["args"], {"x": ["1"]})
+        self.assertTrue(data["url"].endswith("/http_methods/anything/a/b?x=1"))
+        self.assertEqual(data["data"], "")
+
+    def test_custom_verb(self):
+        response = self.client.generic("PURGE", "/http_methods/anything/cache", "stale", content_type="text/plain")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["method"], "PURGE")
+        self.assertEqual(response.json()["data"], "stale")
+
+    def test_head(self):
+        get = self.client.get("/http_methods/anything")
+        head = self.client.head("/http_methods/anything")
+        self.assertEqual(head.status_code, 200)
+        self.assertEqual(head.content, b"")
+        self.assertEqual(head["Content-Type"], get["Content-Type"])
+        # The echoed method differs, so the lengths differ by "HEAD" vs "GET".
+        self.assertEqual(int(head["Content-Length"]), len(get.content) + 1)
+
+    def test_options(self):
+        response = self.client.options("/http_methods/anything")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Allow"], ANYTHING_ALLOW)
+        self.assertEqual(response.json()["method"], "OPTIONS")
+
+    def test_json(self):
+        response = self.client.post("/http_methods/anything", {"a": [1]}, content_type="application/json")
+        self.assertEqual(response.json()["json"], {"a": [1]})
+        self.assertEqual(response.json()["data"], {"a": [1]})
+
+    def test_multipart(self):
+        upload = SimpleUploadedFile("a.txt", b"content", "text/plain")
+        response = self.client.post("/http_methods/anything", {"field": "value", "file": upload})
+        data = response.json()
+        self.assertEqual(data["form"], {"field": ["value"]})
+        self.assertEqual(data["files"], {"file": "a.txt"})
+        self.assertEqual(data["data"], "")
+
+    def test_urlencoded_put_and_patch(self):
+        for method in ("PUT", "PATCH"):
+            with self.subTest(method=method):
+                response = self.client.generic(
+                    method, "/http_methods/anything", "a=1&a=2&b=3", content_type="application/x-www-form-urlencoded"
+                )
+                self.assertEqual(response.json()["form"], {"a": ["1", "2"], "b": ["3"]})
+
+    def test_malformed_json_is_echoed_as_text(self):
+        response = self.client.post("/http_methods/anything", "{nope", content_type="application/json")
+        self.assertEqual(response.json()["data"], "{nope")
+        self.assertIsNone(response.json()["json"])
+
+    def test_empty_body(self):
+        for method in ("POST", "DELETE", "PURGE"):
+            with self.subTest(method=method):
+                response = self.client.generic(method, "/http_methods/anything", "", content_type="application/json")
+                self.assertEqual(response.json()["data"], "")
+                self.assertIsNone(response.json()["json"])
+
+
+class FastBodyTests(SimpleTestCase):
+    def test_urlencoded_put_and_patch(self):
+        for method in ("PUT", "PATCH"):
+            with self.subTest(method=method):
+                request = RequestFactory().generic(
+                    method, "/", "a=1&b=2", content_type="application/x-www-form-urlencoded"
+                )
+                body = fast_body_fields(request)
+                self.assertEqual(body["form"], {"a": ["1"], "b": ["2"]})
+                self.assertEqual(body["data"], {"a": "1", "b": "2"})
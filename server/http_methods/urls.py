@@ -1,12 +1,14 @@
-from django.urls import path
+from django.urls import path, re_path
+from core.fastpath import fast_route
 from . import views
 
 app_name = "http_methods"
 
 urlpatterns = [
-    path("get/", views.GetView.as_view(), name="get"),
-    path("post/", views.PostView.as_view(), name="post"),
-    path("put/", views.PutView.as_view(), name="put"),
-    path("patch/", views.PatchView.as_view(), name="patch"),
-    path("delete/", views.DeleteView.as_view(), name="delete"),
+    path("get/", fast_route(views.GetView, views.fast_get), name="get"),
+    path("post/", fast_route(views.PostView, views.fast_body), name="post"),
+    path("put/", fast_route(views.PutView, views.fast_body), name="put"),
+    path("patch/", fast_route(views.PatchView, views.fast_body), name="patch"),
+    path("delete/", fast_route(views.DeleteView, views.fast_delete), name="delete"),
+    re_path(r"^anything(?:/(?P<rest>.*))?$", views.anything_view, name="anything"),
 ]
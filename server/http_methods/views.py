@@ -1,4 +1,5 @@
 from django.utils.decorators import method_decorator
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
 from rest_framework.decorators import api_view
@@ -8,6 +9,10 @@ from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from core.bodies import content_length
+from core.echo import body_fields, build_envelope
+from core.fastpath import fast_body_fields, json_response, render_json
+
 
 @method_decorator(csrf_exempt, name="dispatch")
 class GetView(APIView):
@@ -52,26 +57,7 @@ class GetView(APIView):
         },
     )
     def get(self, request):
-        response_data = {
-            "args": dict(request.GET),
-            "headers": self._extract_headers(request),
-            "origin": request.META.get('REMOTE_ADDR', ''),
-            "url": request.build_absolute_uri(),
-            "method": "GET"
-        }
-        return Response(response_data)
-
-    def _extract_headers(self, request):
-        """Extract all headers from request"""
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
+        return Response(build_envelope(request, "GET"))
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -107,30 +93,7 @@ class PostView(APIView):
         },
     )
     def post(self, request):
-        response_data = {
-            "args": dict(request.GET),
-            "data": request.data,
-            "files": dict(request.FILES),
-            "form": dict(request.POST),
-            "headers": self._extract_headers(request),
-            "json": request.data if request.content_type == 'application/json' else None,
-            "origin": request.META.get('REMOTE_ADDR', ''),
-            "url": request.build_absolute_uri(),
-            "method": "POST"
-        }
-        return Response(response_data)
-
-    def _extract_headers(self, request):
-        """Extract all headers from request"""
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
+        return Response(build_envelope(request, "POST", body_fields(request)))
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -150,30 +113,7 @@ class PutView(APIView):
         responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)},
     )
     def put(self, request):
-        response_data = {
-            "args": dict(request.GET),
-            "data": request.data,
-            "files": dict(request.FILES),
-            "form": dict(request.POST),
-            "headers": self._extract_headers(request),
-            "json": request.data if request.content_type == 'application/json' else None,
-            "origin": request.META.get('REMOTE_ADDR', ''),
-            "url": request.build_absolute_uri(),
-            "method": "PUT"
-        }
-        return Response(response_data)
-
-    def _extract_headers(self, request):
-        """Extract all headers from request"""
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
+        return Response(build_envelope(request, "PUT", body_fields(request)))
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -193,30 +133,7 @@ class PatchView(APIView):
         responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)},
     )
     def patch(self, request):
-        response_data = {
-            "args": dict(request.GET),
-            "data": request.data,
-            "files": dict(request.FILES),
-            "form": dict(request.POST),
-            "headers": self._extract_headers(request),
-            "json": request.data if request.content_type == 'application/json' else None,
-            "origin": request.META.get('REMOTE_ADDR', ''),
-            "url": request.build_absolute_uri(),
-            "method": "PATCH"
-        }
-        return Response(response_data)
-
-    def _extract_headers(self, request):
-        """Extract all headers from request"""
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
+        return Response(build_envelope(request, "PATCH", body_fields(request)))
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -242,26 +159,79 @@ class DeleteView(APIView):
         }
     )
     def delete(self, request):
-        response_data = {
-            "args": dict(request.GET),
-            "headers": self._extract_headers(request),
-            "origin": request.META.get('REMOTE_ADDR', ''),
-            "url": request.build_absolute_uri(),
-            "method": "DELETE"
+        return Response(build_envelope(request, "DELETE"))
+
+
+# Handlers used by core.fastpath.fast_route when HTTPBIN_FAST_PATH is on.
+
+
+def fast_get(request):
+    return json_response(build_envelope(request, "GET"))
+
+
+def fast_delete(request):
+    return json_response(build_envelope(request, "DELETE"))
+
+
+def fast_body(request):
+    body = fast_body_fields(request)
+    if body is None:
+        return None
+    return json_response(build_envelope(request, request.method, body))
+
+
+# /anything: every verb, one code path, no DRF.
+
+ANYTHING_ALLOW = "GET, HEAD, POST, PUT, PATCH, DELETE, OPTIONS, TRACE"
+
+
+def _anything_body(request):
+    body = fast_body_fields(request)
+    if body is not None:
+        if not content_length(request):
+            # httpbin echoes a missing or empty body as "", not {}.
+            body["data"] = ""
+        return body
+    if request.method == "POST" and request.content_type == "multipart/form-data":
+        return {
+            "data": "",
+            "files": {k: f.name for k, f in request.FILES.items()},
+            "form": dict(request.POST),
+            "json": None,
         }
-        return Response(response_data)
+    # Anything else (text, binary, malformed JSON) is echoed as text.
+    return {"data": request.body.decode("utf-8", "replace"), "files": {}, "form": {}, "json": None}
 
-    def _extract_headers(self, request):
-        """Extract all headers from request"""
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
 
+def _anything_echo(request):
+    return json_response(build_envelope(request, request.method, _anything_body(request)))
 
 
+def _anything_head(request):
+    # The headers a GET would get, without the body.
+    content = render_json(build_envelope(request, request.method, _anything_body(request)))
+    response = HttpResponse(content_type="application/json")
+    response["Content-Length"] = str(len(content))
+    return response
+
+
+def _anything_options(request):
+    response = _anything_echo(request)
+    response["Allow"] = ANYTHING_ALLOW
+    return response
+
+
+# Verbs with special handling; every other verb, including custom ones, echoes.
+ANYTHING_HANDLERS = {
+    "HEAD": _anything_head,
+    "OPTIONS": _anything_options,
+}
+
+
+@csrf_exempt
+def anything_view(request, rest=""):
+    """
+    Echo any request under /http_methods/anything/
+    /http_methods/anything/<path:rest>
+    """
+    return ANYTHING_HANDLERS.get(request.method, _anything_echo)(request)
@@ -1,12 +1,17 @@
 from django.urls import path
+from core.fastpath import fast_route
 from . import views
 
 app_name = "inspection"
 
 urlpatterns = [
-    path("headers/", views.HeadersView.as_view(), name="headers"),
-    path("ip/", views.IPView.as_view(), name="ip"),
-    path("user-agent/", views.UserAgentView.as_view(), name="user-agent"),
-    path("uuid/", views.UUIDView.as_view(), name="uuid"),
-    path("response-headers/", views.ResponseHeadersView.as_view(), name="response-headers"),
+    path("headers/", fast_route(views.HeadersView, views.fast_headers), name="headers"),
+    path("ip/", fast_route(views.IPView, views.fast_ip), name="ip"),
+    path("user-agent/", fast_route(views.UserAgentView, views.fast_user_agent), name="user-agent"),
+    path("uuid/", fast_route(views.UUIDView, views.fast_uuid), name="uuid"),
+    path(
+        "response-headers/",
+        fast_route(views.ResponseHeadersView, views.fast_response_headers),
+        name="response-headers",
+    ),
 ]
@@ -8,17 +8,8 @@ import uuid as uuid_lib
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-
-def _extract_headers(request):
-    headers = {}
-    for key, value in request.META.items():
-        if key.startswith("HTTP_"):
-            header_name = key[5:].replace("_", "-").title()
-            headers[header_name] = value
-        elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-            header_name = key.replace("_", "-").title()
-            headers[header_name] = value
-    return headers
+from core.echo import extract_headers, get_origin
+from core.fastpath import json_response
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -27,7 +18,7 @@ class HeadersView(APIView):
 
     @swagger_auto_schema(responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)})
     def get(self, request):
-        return Response({"headers": _extract_headers(request)})
+        return Response({"headers": extract_headers(request)})
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -36,7 +27,7 @@ class IPView(APIView):
 
     @swagger_auto_schema(responses={200: openapi.Schema(type=openapi.TYPE_OBJECT)})
     def get(self, request):
-        return Response({"origin": request.META.get("REMOTE_ADDR", "")})
+        return Response({"origin": get_origin(request)})
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -79,3 +70,29 @@ class ResponseHeadersView(APIView):
         for k, v in request.GET.items():
             resp[k] = v
         return resp
+
+
+# Handlers used by core.fastpath.fast_route when HTTPBIN_FAST_PATH is on.
+
+
+def fast_headers(request):
+    return json_response({"headers": extract_headers(request)})
+
+
+def fast_ip(request):
+    return json_response({"origin": get_origin(request)})
+
+
+def fast_user_agent(request):
+    return json_response({"user-agent": request.META.get("HTTP_USER_AGENT", "")})
+
+
+def fast_uuid(request):
+    return json_response({"uuid": str(uuid_lib.uuid4())})
+
+
+def fast_response_headers(request):
+    resp = json_response({"args": request.GET.dict()})
+    for k, v in request.GET.items():
+        resp[k] = v
+    return resp
@@ -0,0 +1,14 @@
+"""
+Admin URLconf, mounted with core.routing.lazy_include.
+
+It is imported the first time a path under /admin/ is resolved, so the
+ModelAdmin modules stay out of workers that only serve httpbin endpoints.
+With ``HTTPBIN_LEAN`` the admin app is installed as SimpleAdminConfig and
+autodiscovery happens here instead of at startup.
+"""
+
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
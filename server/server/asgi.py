@@ -3,6 +3,12 @@ ASGI config for server project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve this (e.g. ``uvicorn server.asgi:application``) rather than the WSGI app
+when clients hold many slow responses open: the delay, drip and stream
+endpoints in ``api.views`` are async and only wait on the event loop here.
+Uploads to /api/sink/ are drained by ``core.asgi.BodySinkApplication`` as
+they arrive instead of being spooled by Django first.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +19,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from core.asgi import BodySinkApplication  # noqa: E402
+
+# Keep in sync with the "sink" route in api.urls.
+application = BodySinkApplication(django_application, ["/api/sink/"])
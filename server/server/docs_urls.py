@@ -0,0 +1,37 @@
+"""
+Swagger / ReDoc URLconf, mounted with core.routing.lazy_include.
+
+Importing drf_yasg's views and renderers pulls in swagger_spec_validator,
+jsonschema and requests, so this module is only loaded once a docs URL is
+first resolved or any URL is reversed.
+"""
+
+from django.urls import path
+
+from drf_yasg import openapi
+
+from core.schema import get_cached_schema_view
+
+# Spec documents are generated once and served from memory with an ETag;
+# see core.schema.
+schema_view = get_cached_schema_view(
+    openapi.Info(
+        title="My API",
+        default_version="v1",
+        description="Test description",
+    ),
+    public=True,
+)
+
+urlpatterns = [
+    path(
+        "swagger/",
+        schema_view.with_ui("swagger"),
+        name="schema-swagger-ui",
+    ),
+    path(
+        "redoc/",
+        schema_view.with_ui("redoc"),
+        name="schema-redoc",
+    ),
+]
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "drf_yasg",
     # My Apps
+    "core",
     "api",
     "cookies",
     "http_methods",
@@ -49,16 +51,43 @@ INSTALLED_APPS = [
     "statuscode",
 ]
 
+# Lean startup for workers that only serve httpbin endpoints: the admin skips
+# autodiscovery until /admin/ is first resolved (see server.admin_urls) and
+# simplejwt is not installed as an app. auth.tokens still uses its
+# TokenBackend, which needs no app registry entry; the app itself only adds
+# translations and the token blacklist models. Profile with
+# `manage.py profile_startup`.
+HTTPBIN_LEAN = os.environ.get("HTTPBIN_LEAN", "") == "1"
+if HTTPBIN_LEAN:
+    INSTALLED_APPS[INSTALLED_APPS.index("django.contrib.admin")] = "django.contrib.admin.apps.SimpleAdminConfig"
+    INSTALLED_APPS.remove("rest_framework_simplejwt")
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middleware.CompressionMiddleware",
+    "core.middleware.RequestDecompressionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.RouteProfileMiddleware",
 ]
 
+# Stateful middleware only runs under these prefixes (see
+# core.middleware.RouteProfileMiddleware); the httpbin endpoints never touch
+# sessions, request.user or messages.
+HTTPBIN_MIDDLEWARE_PROFILES = {
+    "/admin/": [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    ],
+}
+
+# The admin checks only look at MIDDLEWARE; the /admin/ profile above provides
+# sessions, auth and messages where the admin needs them, and
+# core.checks.check_admin_profile (core.E001-E004) verifies that it does.
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
 ROOT_URLCONF = "server.urls"
 
 TEMPLATES = [
@@ -137,3 +166,61 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ]
 }
+
+# HTTPBin settings
+# Responses smaller than this many bytes are sent uncompressed.
+HTTPBIN_COMPRESSION_MIN_SIZE = 200
+
+# POST/PUT/PATCH echo bodies larger than this are read incrementally and
+# summarized (length, digests, head/tail sample) instead of parsed and echoed.
+HTTPBIN_STREAM_ECHO_THRESHOLD = 1024 * 1024
+
+# Request bodies with a Content-Encoding are decoded up to this size, and
+# rejected once they inflate to more than MAX_RATIO times their compressed size
+# (core.middleware.RequestDecompressionMiddleware).
+HTTPBIN_DECOMPRESS_MAX_SIZE = 64 * 1024 * 1024
+HTTPBIN_DECOMPRESS_MAX_RATIO = 100
+# Bodies under these prefixes are passed on still encoded: the upload sink
+# counts the bytes as sent instead of inflating them first.
+HTTPBIN_DECOMPRESS_EXEMPT_PATHS = ["/api/sink/"]
+
+# Digest auth nonces (auth.nonces): lifetime in seconds and the in-process
+# store's size bound. Set NONCE_CACHE to a CACHES alias to share nonces
+# between workers instead.
+HTTPBIN_DIGEST_NONCE_TTL = 300
+HTTPBIN_DIGEST_NONCE_MAX_ENTRIES = 100_000
+HTTPBIN_DIGEST_NONCE_CACHE = None
+
+# JWTs issued and verified by /auth/jwt/ (auth.tokens). HS256 signs with
+# SIGNING_KEY; RS256 needs the cryptography package and PEM key file paths.
+# Verified tokens are memoized until exp in an LRU of VERIFY_CACHE_SIZE.
+HTTPBIN_JWT_SIGNING_KEY = SECRET_KEY
+HTTPBIN_JWT_RSA_PRIVATE_KEY = os.environ.get("HTTPBIN_JWT_RSA_PRIVATE_KEY")
+HTTPBIN_JWT_RSA_PUBLIC_KEY = os.environ.get("HTTPBIN_JWT_RSA_PUBLIC_KEY")
+HTTPBIN_JWT_LIFETIME = 300
+HTTPBIN_JWT_MAX_LIFETIME = 24 * 60 * 60
+HTTPBIN_JWT_LEEWAY = 0
+HTTPBIN_JWT_VERIFY_CACHE_SIZE = 4096
+
+# /auth/validate-token/batch/: most tokens accepted per request, and the size
+# from which JSON-array results are streamed instead of sent in one response.
+HTTPBIN_TOKEN_BATCH_MAX_ITEMS = 100_000
+HTTPBIN_TOKEN_BATCH_STREAM_THRESHOLD = 1000
+
+# Signs like the default TimestampSigner, caching derived HMAC keys per salt
+# (used by set_signed_cookie/get_signed_cookie and /cookies/signed/).
+SIGNING_BACKEND = "cookies.jar.CookieSigner"
+
+# Upper bounds for /cookies/bulk/: cookies per response and bytes per value.
+HTTPBIN_COOKIE_BULK_MAX_COUNT = 1000
+HTTPBIN_COOKIE_BULK_MAX_SIZE = 4096
+
+# Limits for /api/forms/post/, whose uploads are hashed in flight and never
+# stored (api.uploads.DigestUploadHandler). DATA_UPLOAD_MAX_NUMBER_FILES still
+# applies on top of the part limit.
+HTTPBIN_UPLOAD_MAX_PARTS = 100
+HTTPBIN_UPLOAD_MAX_SIZE = 64 * 1024 * 1024
+
+# Route the hot echo endpoints (/http_methods/*, /inspection/*,
+# /statuscode/status/) through core.fastpath instead of DRF dispatch.
+HTTPBIN_FAST_PATH = os.environ.get("HTTPBIN_FAST_PATH", "") == "1"
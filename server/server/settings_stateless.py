@@ -0,0 +1,45 @@
+"""
+Database-free settings for stateless deployments.
+
+    DJANGO_SETTINGS_MODULE=server.settings_stateless gunicorn server.wsgi
+
+Everything in ``server.settings`` applies, minus the model-backed features:
+no database is configured, the admin, sessions and messages apps are not
+installed, and authentication is anonymous-only. Every httpbin endpoint works
+unchanged with zero file or DB I/O; ``manage.py migrate`` and ``/admin/`` are
+not available. Compare throughput with ``manage.py bench_stateless``, and run
+the tests against this profile with
+``manage.py test --settings=server.settings_stateless``.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, REST_FRAMEWORK
+
+# Any ORM access fails loudly instead of opening db.sqlite3.
+DATABASES = {}
+
+# auth and contenttypes stay installed: DRF's AnonymousUser and simplejwt
+# import their models, but nothing queries them.
+STATEFUL_APPS = (
+    "django.contrib.admin",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+)
+INSTALLED_APPS = [app for app in INSTALLED_APPS if not app.startswith(STATEFUL_APPS)]
+
+# Anonymous-only: django.contrib.auth.authenticate() has no backend to query,
+# and DRF runs no Session/Basic authentication against the user table. The
+# httpbin auth endpoints bring their own authentication classes.
+AUTHENTICATION_BACKENDS = []
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+}
+
+# The only route profile is the admin's.
+HTTPBIN_MIDDLEWARE_PROFILES = {}
+
+# Should a profile add SessionMiddleware or MessageMiddleware back, they keep
+# their state in signed cookies rather than the database.
+SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
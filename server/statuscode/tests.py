@@ -1,3 +1,103 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .views import choose_status, parse_status_spec
+
+
+class StatusSpecTests(SimpleTestCase):
+    def test_weighted_spec(self):
+        self.assertEqual(parse_status_spec("200:0.5,500:0.25,503:0.25"), ((200, 500, 503), (0.5, 0.75, 1.0)))
+
+    def test_default_weight_is_one(self):
+        self.assertEqual(parse_status_spec("200,500:2,503"), ((200, 500, 503), (1.0, 3.0, 4.0)))
+
+    def test_all_zero_weights_are_rejected(self):
+        response = self.client.get("/statuscode/status/200:0,500:0/")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "At least one status code weight must be positive.")
+
+    def test_overflowing_weights_are_rejected(self):
+        response = self.client.get("/statuscode/status/200:1e308,500:1e308/")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Status code weights are too large.")
+
+    def test_invalid_weights_are_rejected(self):
+        for spec in ("200:-1", "200:nan", "200:inf", "200:x"):
+            with self.subTest(spec=spec):
+                self.assertEqual(self.client.get(f"/statuscode/status/{spec}/").status_code, 400)
+
+    def test_sampling_stays_within_codes(self):
+        for value in (0.0, 0.3, 0.5, 0.999999999):
+            with self.subTest(value=value), mock.patch("statuscode.views.random.random", return_value=value):
+                self.assertIn(choose_status("200:1,500:1,503:0"), (200, 500))
+
+    def test_sampling_follows_weights(self):
+        with mock.patch("statuscode.views.random.random", return_value=0.05):
+            self.assertEqual(choose_status("200:1,500:9"), 200)
+        with mock.patch("statuscode.views.random.random", return_value=0.5):
+            self.assertEqual(choose_status("200:1,500:9"), 500)
+
+    def test_single_code(self):
+        response = self.client.get("/statuscode/status/418/")
+        self.assertEqual(response.status_code, 418)
+        self.assertEqual(response.json()["description"], "I'm a Teapot")
+
+
+class RedirectChainTests(SimpleTestCase):
+    def follow_chain(self, url):
+        locations = []
+        response = self.client.get(url)
+        while response.status_code == 302:
+            locations.append(response["Location"])
+            response = self.client.get(response["Location"])
+        return locations, response
+
+    def test_relative_redirects(self):
+        locations, final = self.follow_chain("/statuscode/relative-redirect/3/")
+        self.assertEqual(
+            locations,
+            ["/statuscode/relative-redirect/2/", "/statuscode/relative-redirect/1/", "/http_methods/get/"],
+        )
+        self.assertEqual(len({len(location) for location in locations[:-1]}), 1)
+        self.assertEqual(final.status_code, 200)
+        self.assertEqual(final.json()["method"], "GET")
+
+    def test_absolute_redirects(self):
+        locations, final = self.follow_chain("/statuscode/absolute-redirect/2/")
+        self.assertEqual(
+            locations, ["http://testserver/statuscode/absolute-redirect/1/", "http://testserver/http_methods/get/"]
+        )
+        self.assertEqual(final.status_code, 200)
+
+    def test_zero_hops_is_rejected(self):
+        for url in ("/statuscode/relative-redirect/0/", "/statuscode/absolute-redirect/0/"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 400)
+
+    def test_unsafe_methods_are_not_allowed(self):
+        self.assertEqual(self.client.post("/statuscode/relative-redirect/2/").status_code, 405)
+
+    def test_counted_redirects(self):
+        locations, final = self.follow_chain("/statuscode/redirect/3/?keep=1")
+        self.assertEqual(len(locations), 3)
+        self.assertEqual(len({len(location) for location in locations}), 1)
+        self.assertTrue(locations[-1].endswith("/statuscode/redirect/3/?keep=1&count=3"))
+        self.assertEqual(final.status_code, 200)
+        self.assertEqual(final.json()["total_redirects"], 3)
+
+    def test_count_is_replaced_not_appended(self):
+        response = self.client.get("/statuscode/redirect/5/?count=2&keep=1")
+        self.assertEqual(response["Location"], "http://testserver/statuscode/redirect/5/?count=3&keep=1")
+
+    def test_redirect_to_status_codes(self):
+        for code in (301, 302, 303, 307, 308):
+            with self.subTest(code=code):
+                response = self.client.get(f"/statuscode/redirect-to/?url=/http_methods/get/&status_code={code}")
+                self.assertEqual(response.status_code, code)
+                self.assertEqual(response["Location"], "/http_methods/get/")
+
+    def test_redirect_to_rejects_other_codes(self):
+        for query in ("url=/x/&status_code=200", "url=/x/&status_code=abc", "status_code=302"):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/statuscode/redirect-to/?{query}").status_code, 400)
@@ -1,11 +1,14 @@
 from django.urls import path
+from core.fastpath import fast_route
 from . import views
 
 app_name = "statuscode"
 
 urlpatterns = [
-    path("status/<int:code>/", views.StatusCodeView.as_view(), name="status"),
+    path("status/<str:codes>/", fast_route(views.StatusCodeView, views.fast_status), name="status"),
     path("redirect/<int:n>/", views.RedirectView.as_view(), name="redirect"),
+    path("relative-redirect/<int:n>/", views.relative_redirect_view, name="relative-redirect"),
+    path("absolute-redirect/<int:n>/", views.absolute_redirect_view, name="absolute-redirect"),
     path("redirect-to/", views.RedirectToView.as_view(), name="redirect-to"),
     path("deny/", views.DenyView.as_view(), name="deny"),
 ]
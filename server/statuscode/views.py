@@ -1,20 +1,99 @@
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.urls import get_script_prefix
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_safe
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
+import math
 import random
+from bisect import bisect_right
+from functools import lru_cache
+from http import HTTPStatus
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from core.echo import extract_headers, get_origin
+from core.fastpath import json_response
+
+
+# Every status code Python knows about, built once.
+STATUS_DESCRIPTIONS = {http_status.value: http_status.phrase for http_status in HTTPStatus}
+
+STATUS_SPEC_CACHE_SIZE = 1024
+
+
+def _get_status_description(status_code):
+    return STATUS_DESCRIPTIONS.get(status_code, "Unknown Status Code")
+
+
+@lru_cache(maxsize=STATUS_SPEC_CACHE_SIZE)
+def parse_status_spec(spec):
+    """
+    Parse ``"200:0.9,500:0.05,503:0.05"`` into (codes, cumulative weights).
+
+    A code without ``:weight`` has weight 1, so ``"200,500"`` picks either
+    with equal probability. Raises ValueError with a client-facing message.
+    """
+    codes = []
+    cumulative = []
+    total = 0.0
+    for item in spec.split(","):
+        code, has_weight, weight = item.partition(":")
+        try:
+            code = int(code)
+        except ValueError:
+            raise ValueError("Status code must be a valid integer.") from None
+        if not 100 <= code <= 599:
+            raise ValueError("Invalid status code. Must be between 100-599.")
+        try:
+            weight = float(weight) if has_weight else 1.0
+        except ValueError:
+            weight = -1.0
+        if not 0.0 <= weight < math.inf:
+            raise ValueError("Status code weights must be non-negative numbers.")
+        total += weight
+        codes.append(code)
+        cumulative.append(total)
+    if not math.isfinite(total):
+        raise ValueError("Status code weights are too large.")
+    if total <= 0:
+        raise ValueError("At least one status code weight must be positive.")
+    return tuple(codes), tuple(cumulative)
+
+
+def choose_status(spec):
+    """A status code drawn from a ``parse_status_spec`` spec"""
+    codes, cumulative = parse_status_spec(spec)
+    if len(codes) == 1:
+        return codes[0]
+    return codes[bisect_right(cumulative, random.random() * cumulative[-1])]
+
+
+def status_payload(request, code):
+    """Body and status for /statuscode/status/{codes}/"""
+    try:
+        status_code = choose_status(str(code))
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    response_data = {
+        "code": status_code,
+        "description": _get_status_description(status_code),
+        "headers": extract_headers(request),
+        "url": request.build_absolute_uri(),
+        "origin": get_origin(request)
+    }
+    return response_data, status_code
+
 
 @method_decorator(csrf_exempt, name="dispatch")
 class StatusCodeView(APIView):
     """
-    Status Code endpoint - responds with the given HTTP status code
-    GET /statuscode/status/{code}/
+    Status Code endpoint - responds with the given HTTP status code, or one
+    drawn at random from weighted codes (e.g. 200:0.9,500:0.05,503:0.05)
+    GET /statuscode/status/{codes}/
     """
     permission_classes = [AllowAny]
 
@@ -32,66 +111,9 @@ class StatusCodeView(APIView):
             )
         }
     )
-    def get(self, request, code):
-        try:
-            status_code = int(code)
-            if 100 <= status_code <= 599:
-                response_data = {
-                    "code": status_code,
-                    "description": self._get_status_description(status_code),
-                    "headers": self._extract_headers(request),
-                    "url": request.build_absolute_uri(),
-                    "origin": request.META.get('REMOTE_ADDR', '')
-                }
-                return Response(response_data, status=status_code)
-            else:
-                return Response(
-                    {"error": "Invalid status code. Must be between 100-599."}, 
-                    status=400
-                )
-        except ValueError:
-            return Response(
-                {"error": "Status code must be a valid integer."}, 
-                status=400
-            )
-
-    def _get_status_description(self, status_code):
-        descriptions = {
-            200: "OK",
-            201: "Created",
-            202: "Accepted",
-            204: "No Content",
-            301: "Moved Permanently",
-            302: "Found",
-            304: "Not Modified",
-            307: "Temporary Redirect",
-            308: "Permanent Redirect",
-            400: "Bad Request",
-            401: "Unauthorized",
-            403: "Forbidden",
-            404: "Not Found",
-            405: "Method Not Allowed",
-            408: "Request Timeout",
-            409: "Conflict",
-            429: "Too Many Requests",
-            500: "Internal Server Error",
-            501: "Not Implemented",
-            502: "Bad Gateway",
-            503: "Service Unavailable",
-            504: "Gateway Timeout"
-        }
-        return descriptions.get(status_code, "Unknown Status Code")
-
-    def _extract_headers(self, request):
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
+    def get(self, request, codes):
+        data, status_code = status_payload(request, codes)
+        return Response(data, status=status_code)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -128,13 +150,16 @@ class RedirectView(APIView):
                     "message": f"Redirected {redirect_count} times successfully",
                     "final_url": request.build_absolute_uri(),
                     "total_redirects": redirect_count,
-                    "headers": self._extract_headers(request),
-                    "origin": request.META.get('REMOTE_ADDR', '')
+                    "headers": extract_headers(request),
+                    "origin": get_origin(request)
                 }
                 return Response(response_data)
             else:
-                next_count = current_count + 1
-                redirect_url = f"{request.build_absolute_uri()}?count={next_count}"
+                # Replace the counter rather than appending to the current
+                # query string, so the URL stays the same length every hop.
+                query = request.GET.copy()
+                query["count"] = current_count + 1
+                redirect_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
                 return HttpResponseRedirect(redirect_url)
         except ValueError:
             return Response(
@@ -142,17 +167,6 @@ class RedirectView(APIView):
                 status=400
             )
 
-    def _extract_headers(self, request):
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
-
 
 @method_decorator(csrf_exempt, name="dispatch")
 class RedirectToView(APIView):
@@ -195,7 +209,44 @@ class RedirectToView(APIView):
                 )
         except ValueError:
             return Response({"error": "Status code must be a valid integer."}, status=400)
-        return HttpResponseRedirect(target_url)
+        return HttpResponseRedirect(target_url, status=status_code_int)
+
+
+# Path-encoded redirect chains: the remaining hop count is part of the path,
+# so every hop has a URL of the same length and costs the same. Hops are plain
+# Django views that only build a Location; nothing is echoed or rendered.
+# The Location is derived from the request path rather than reverse(), which
+# would import every lazily included URLconf (docs, admin) on the first hop.
+
+
+def _redirect_hop(request, n, absolute):
+    if n < 1:
+        return JsonResponse({"error": "Redirect count must be at least 1."}, status=400)
+    if n > 1:
+        location = f"{request.path[: request.path.rstrip('/').rindex('/') + 1]}{n - 1}/"
+    else:
+        location = f"{get_script_prefix()}http_methods/get/"
+    if absolute:
+        location = request.build_absolute_uri(location)
+    return HttpResponseRedirect(location)
+
+
+@require_safe
+def relative_redirect_view(request, n):
+    """
+    302 to /statuscode/relative-redirect/{n-1}/ with a relative Location,
+    ending at /http_methods/get/
+    """
+    return _redirect_hop(request, n, absolute=False)
+
+
+@require_safe
+def absolute_redirect_view(request, n):
+    """
+    302 to /statuscode/absolute-redirect/{n-1}/ with an absolute Location,
+    ending at /http_methods/get/
+    """
+    return _redirect_hop(request, n, absolute=True)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -212,19 +263,16 @@ class DenyView(APIView):
             "message": "Access Denied",
             "code": 403,
             "description": "Forbidden",
-            "headers": self._extract_headers(request),
+            "headers": extract_headers(request),
             "url": request.build_absolute_uri(),
-            "origin": request.META.get('REMOTE_ADDR', '')
+            "origin": get_origin(request)
         }
         return Response(response_data, status=403)
 
-    def _extract_headers(self, request):
-        headers = {}
-        for key, value in request.META.items():
-            if key.startswith("HTTP_"):
-                header_name = key[5:].replace("_", "-").title()
-                headers[header_name] = value
-            elif key in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
-                header_name = key.replace("_", "-").title()
-                headers[header_name] = value
-        return headers
+
+# Handler used by core.fastpath.fast_route when HTTPBIN_FAST_PATH is on.
+
+
+def fast_status(request, codes):
+    data, status_code = status_payload(request, codes)
+    return json_response(data, status=status_code)